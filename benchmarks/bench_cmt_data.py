@@ -0,0 +1,116 @@
+"""
+Benchmarks for loading and looking up events in the CMT catalog.
+"""
+
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from cmt_solutions import cmt_data
+from cmt_solutions.catalog import CMTCatalog
+
+from . import synthetic
+
+# Catalog sizes, from the current catalog size up to a large global catalog
+CATALOG_SIZES = [4_000, 100_000, 1_000_000]
+
+
+class CMTDataSuite:
+    """Benchmarks for loading the catalog from CSV."""
+
+    params = CATALOG_SIZES
+    param_names = ["n_events"]
+    timeout = 600
+
+    def setup_cache(self) -> dict[int, str]:
+        """Write a synthetic catalog of each size, shared by every benchmark."""
+        directory = Path(tempfile.mkdtemp(prefix="cmt_benchmarks_"))
+        return {
+            n_events: str(
+                synthetic.write_synthetic_cmt_catalog(
+                    directory / f"cmt_{n_events}.csv", n_events
+                )
+            )
+            for n_events in CATALOG_SIZES
+        }
+
+    def setup(self, paths: dict[int, str], n_events: int):
+        self.original_path = cmt_data.CMT_DATA_PATH
+        cmt_data.CMT_DATA_PATH = Path(paths[n_events])
+        # Look up an event from the middle of the catalog
+        public_ids = pd.read_csv(paths[n_events], usecols=["PublicID"], dtype=str)
+        self.event_id = public_ids["PublicID"].iloc[n_events // 2]
+
+    def teardown(self, paths: dict[int, str], n_events: int):
+        cmt_data.CMT_DATA_PATH = self.original_path
+
+    def time_get_cmt_data(self, paths: dict[int, str], n_events: int):
+        cmt_data.get_cmt_data()
+
+    def time_get_cmt_data_event(self, paths: dict[int, str], n_events: int):
+        cmt_data.get_cmt_data(self.event_id)
+
+    def time_iter_cmt_data_filtered(self, paths: dict[int, str], n_events: int):
+        for _ in cmt_data.iter_cmt_data(
+            cmt_data.CMT_DATA_PATH,
+            columns=["PublicID", "Latitude", "Longitude", "Mw"],
+            min_mw=5.0,
+            bbox=(170.0, -45.0, 178.0, -38.0),
+        ):
+            pass
+
+    def time_catalog_from_csv(self, paths: dict[int, str], n_events: int):
+        CMTCatalog.from_csv(cmt_data.CMT_DATA_PATH)
+
+    def peakmem_get_cmt_data(self, paths: dict[int, str], n_events: int):
+        cmt_data.get_cmt_data()
+
+    def peakmem_catalog_from_csv(self, paths: dict[int, str], n_events: int):
+        CMTCatalog.from_csv(cmt_data.CMT_DATA_PATH)
+
+
+class CMTCatalogSuite:
+    """Benchmarks for in-memory access to a loaded catalog."""
+
+    params = CATALOG_SIZES
+    param_names = ["n_events"]
+    timeout = 600
+
+    def setup(self, n_events: int):
+        self.df = synthetic.synthetic_cmt_catalog(n_events)
+        self.catalog = CMTCatalog.from_dataframe(self.df)
+        self.event_ids = self.df["PublicID"].sample(1_000, replace=True, random_state=0).tolist()
+
+    def time_dataframe_lookup(self, n_events: int):
+        indexed = self.df.set_index("PublicID")
+        for event_id in self.event_ids:
+            indexed.loc[event_id]
+
+    def time_catalog_lookup(self, n_events: int):
+        catalog = CMTCatalog.from_dataframe(self.df)
+        for event_id in self.event_ids:
+            catalog.get_event(event_id).Mw
+
+    def time_catalog_to_dataframe(self, n_events: int):
+        self.catalog.to_dataframe()
+
+    def track_dataframe_bytes(self, n_events: int) -> int:
+        return int(self.df.memory_usage(deep=True).sum())
+
+    track_dataframe_bytes.unit = "bytes"
+
+    def track_catalog_bytes(self, n_events: int) -> int:
+        return self.catalog.nbytes
+
+    track_catalog_bytes.unit = "bytes"
+
+
+def timeraw_import_cmt_solutions() -> str:
+    """Cold import of the top level package."""
+    return "import cmt_solutions"
+
+
+def timeraw_import_cmt_data() -> str:
+    """Cold import of the CSV loading module."""
+    return "import cmt_solutions.cmt_data"
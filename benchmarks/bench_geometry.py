@@ -0,0 +1,60 @@
+"""
+Benchmarks for the map geometry used by the reviewer.
+"""
+
+from cmt_solutions import geometry
+
+from . import synthetic
+
+
+class SegmentsFromCornersSuite:
+    """Benchmarks for building the nodal plane line layers."""
+
+    params = [100, 4_000]
+    param_names = ["n_planes"]
+    timeout = 600
+
+    def setup(self, n_planes: int):
+        self.corners = synthetic.synthetic_plane_corners(n_planes)
+
+    def time_segments_from_corners(self, n_planes: int):
+        for corners in self.corners:
+            geometry.segments_from_corners(corners, 45.0, [0, 255, 0])
+
+
+class FaultTracesSuite:
+    """Benchmarks for preparing the fault traces shown by the reviewer."""
+
+    params = [1_000, 10_000]
+    param_names = ["n_faults"]
+    timeout = 600
+
+    def setup(self, n_faults: int):
+        self.fault_df = synthetic.synthetic_fault_traces(n_faults)
+
+    def time_split_dateline_shapely(self, n_faults: int):
+        for trace in self.fault_df["trace"]:
+            geometry.split_dateline_shapely(trace)
+
+    def time_fault_traces_dataframe(self, n_faults: int):
+        geometry.fault_traces_dataframe(self.fault_df)
+
+
+class GridBinsSuite:
+    """Benchmarks for aggregating events for the reviewer's overview map."""
+
+    params = ([4_000, 100_000], [10, 50])
+    param_names = ["n_events", "cell_size_km"]
+
+    def setup(self, n_events: int, cell_size_km: int):
+        self.events = synthetic.synthetic_cmt_catalog(n_events)
+        self.reviewed = self.events["reviewed"].astype(str).str.lower() == "true"
+
+    def time_grid_bins(self, n_events: int, cell_size_km: int):
+        geometry.grid_bins(
+            self.events["Latitude"].to_numpy(),
+            self.events["Longitude"].to_numpy(),
+            cell_size_km,
+            reviewed=self.reviewed.to_numpy(),
+            magnitude=self.events["Mw"].to_numpy(),
+        )
@@ -0,0 +1,28 @@
+"""
+Benchmarks for matching John Townend events to GeoNet events.
+"""
+
+from cmt_solutions import matching
+
+from . import synthetic
+
+
+class MatchGeoNetEventsSuite:
+    """
+    Benchmarks for matching John Townend events to GeoNet events.
+
+    The matching compares every event against the whole GeoNet catalog, so
+    smaller catalogs are used than for the other benchmarks.
+    """
+
+    params = ([500, 4_000], [10_000, 100_000])
+    param_names = ["n_events", "n_geonet_events"]
+    timeout = 1200
+
+    def setup(self, n_events: int, n_geonet_events: int):
+        self.john_townend_df, self.geonet_df = synthetic.synthetic_matching_catalogs(
+            n_events, n_geonet_events
+        )
+
+    def time_match_geonet_events(self, n_events: int, n_geonet_events: int):
+        matching.match_geonet_events(self.john_townend_df, self.geonet_df)
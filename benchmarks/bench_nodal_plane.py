@@ -0,0 +1,21 @@
+"""
+Benchmarks for computing conjugate nodal planes.
+"""
+
+from cmt_solutions import nodal_plane
+
+from . import synthetic
+
+
+class ConjugateNodalPlaneSuite:
+    """Benchmarks for adding the conjugate plane to every event."""
+
+    params = [4_000, 100_000, 1_000_000]
+    param_names = ["n_events"]
+    timeout = 1200
+
+    def setup(self, n_events: int):
+        self.df = synthetic.synthetic_cmt_catalog(n_events)[["strike1", "dip1", "rake1"]]
+
+    def time_add_conjugate_nodal_planes(self, n_events: int):
+        nodal_plane.add_conjugate_nodal_planes(self.df.copy())
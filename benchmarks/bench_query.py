@@ -0,0 +1,48 @@
+"""
+Benchmarks for the in-memory catalog indexes used by the catalog service.
+"""
+
+from datetime import datetime
+
+from cmt_solutions.catalog import CMTCatalog
+from cmt_solutions.query import CatalogIndex
+
+from . import synthetic
+
+
+class CatalogIndexSuite:
+    """Benchmarks for building the indexes and answering queries."""
+
+    params = [4_000, 100_000, 1_000_000]
+    param_names = ["n_events"]
+    timeout = 600
+
+    def setup(self, n_events: int):
+        self.catalog = CMTCatalog.from_dataframe(synthetic.synthetic_cmt_catalog(n_events))
+        self.index = CatalogIndex(self.catalog)
+        self.event_id = self.catalog[n_events // 2]["PublicID"]
+
+    def time_build_index(self, n_events: int):
+        CatalogIndex(self.catalog)
+
+    def time_get_event(self, n_events: int):
+        self.index.records([self.index.event_row(self.event_id)])
+
+    def time_query_magnitude(self, n_events: int):
+        self.index.query(min_mw=6.0)
+
+    def time_query_bbox(self, n_events: int):
+        self.index.query(bbox=(172.0, -44.0, 173.0, -43.0))
+
+    def time_query_combined(self, n_events: int):
+        self.index.query(
+            min_mw=4.5,
+            start_date=datetime(2010, 1, 1),
+            bbox=(170.0, -45.0, 178.0, -38.0),
+        )
+
+    def time_query_records(self, n_events: int):
+        self.index.records(
+            self.index.query(min_mw=5.0, bbox=(172.0, -44.0, 173.0, -43.0)),
+            ["PublicID", "Date", "Latitude", "Longitude", "Mw"],
+        )
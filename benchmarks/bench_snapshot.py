@@ -0,0 +1,48 @@
+"""
+Benchmarks for recording and comparing catalog snapshots.
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from cmt_solutions.snapshot import SnapshotStore
+
+from . import synthetic
+
+
+class SnapshotSuite:
+    """Benchmarks for snapshots of a catalog with a single changed event."""
+
+    params = [4_000, 100_000]
+    param_names = ["n_events"]
+    timeout = 600
+
+    def setup(self, n_events: int):
+        self.directory = Path(tempfile.mkdtemp(prefix="cmt_snapshot_benchmarks_"))
+        self.catalog_path = synthetic.write_synthetic_cmt_catalog(
+            self.directory / "cmt.csv", n_events
+        )
+        self.store = SnapshotStore(self.directory / "store")
+        self.old_id = self.store.snapshot(self.catalog_path)
+
+        # Review a single event, which changes one block
+        catalog_df = pd.read_csv(self.catalog_path, dtype=str, keep_default_na=False)
+        catalog_df.loc[n_events // 2, "reviewed"] = "True"
+        self.changed_path = self.directory / "cmt_changed.csv"
+        catalog_df.to_csv(self.changed_path, index=False)
+        self.new_id = self.store.snapshot(self.changed_path)
+
+    def teardown(self, n_events: int):
+        shutil.rmtree(self.directory)
+
+    def time_snapshot_unchanged(self, n_events: int):
+        self.store.snapshot(self.catalog_path)
+
+    def time_diff_one_block(self, n_events: int):
+        self.store.diff(self.old_id, self.new_id)
+
+    def time_load(self, n_events: int):
+        self.store.load(self.new_id)
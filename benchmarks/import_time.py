@@ -0,0 +1,166 @@
+"""
+Checks the cold import time of the cmt_solutions package against a budget.
+
+Each module is imported in a fresh interpreter with `-X importtime` and the
+cumulative time of every top-level import it triggers is summed. Imports that
+the interpreter performs at startup anyway are excluded. The command exits
+with a non-zero status if any module exceeds its budget or imports one of
+the forbidden heavy dependencies.
+"""
+
+import re
+import statistics
+import subprocess
+import sys
+from typing import Annotated
+
+import typer
+
+from qcore import cli
+
+app = typer.Typer(pretty_exceptions_enable=False)
+
+# Default budget (in seconds) for each module checked
+DEFAULT_BUDGETS = {
+    "cmt_solutions": 0.05,
+    "cmt_solutions.cmt_data": 1.0,
+    "cmt_solutions.nodal_plane": 1.0,
+    "cmt_solutions.catalog": 1.0,
+    "cmt_solutions.client": 1.0,
+    "cmt_solutions.query": 1.0,
+    "cmt_solutions.snapshot": 1.0,
+}
+# Heavy dependencies that none of the default modules should import
+DEFAULT_FORBIDDEN = ["obspy", "matplotlib", "source_modelling", "streamlit"]
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_import_time(stderr: str) -> tuple[dict[str, int], set[str]]:
+    """
+    Parse the output of `python -X importtime` into import times and imported modules.
+
+    Parameters
+    ----------
+    stderr : str
+        The stderr of the interpreter run with `-X importtime`.
+
+    Returns
+    -------
+    dict[str, int]
+        Mapping of each top-level imported module to its cumulative import time in microseconds.
+    set[str]
+        Every imported module, including those imported by other modules.
+    """
+    top_level = {}
+    imported = set()
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if not match:
+            continue
+        imported.add(match.group(4))
+        # Nested imports are indented by two spaces per level
+        if len(match.group(3)) == 1:
+            top_level[match.group(4)] = int(match.group(2))
+    return top_level, imported
+
+
+def run_import(statement: str) -> tuple[dict[str, int], set[str]]:
+    """
+    Run a statement in a fresh interpreter and return the imports it made.
+
+    Parameters
+    ----------
+    statement : str
+        The Python statement to run.
+
+    Returns
+    -------
+    dict[str, int]
+        Mapping of each top-level imported module to its cumulative import time in microseconds.
+    set[str]
+        Every imported module, including those imported by other modules.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_import_time(result.stderr)
+
+
+def module_import_time(module: str, repeats: int) -> tuple[float, set[str]]:
+    """
+    Measure the cold import time of a module.
+
+    Parameters
+    ----------
+    module : str
+        The module to import.
+    repeats : int
+        Number of fresh interpreters to measure, the median time is returned.
+
+    Returns
+    -------
+    float
+        The median import time in seconds.
+    set[str]
+        Every module imported by the module, directly or through other modules.
+    """
+    startup_top_level, startup_modules = run_import("pass")
+    times = []
+    imported = set()
+    for _ in range(repeats):
+        top_level, all_modules = run_import(f"import {module}")
+        new_modules = {
+            name: us for name, us in top_level.items() if name not in startup_top_level
+        }
+        times.append(sum(new_modules.values()) / 1e6)
+        imported = all_modules - startup_modules
+    return statistics.median(times), imported
+
+
+@cli.from_docstring(app)
+def check_import_time(
+    modules: Annotated[list[str], typer.Argument()] = None,
+    budget: float = None,
+    repeats: int = 5,
+    forbid: list[str] = None,
+):
+    """
+    Check the cold import time of cmt_solutions modules against a budget.
+
+    Parameters
+    ----------
+    modules : list[str]
+        Modules to check, by default the cmt_solutions package and its submodules.
+    budget : float
+        Budget in seconds applied to every module, by default a per module budget.
+    repeats : int
+        Number of fresh interpreters used to measure each module.
+    forbid : list[str]
+        Top-level packages that must not be imported, by default obspy, matplotlib, source_modelling and streamlit.
+    """
+    modules = modules or list(DEFAULT_BUDGETS)
+    forbid = DEFAULT_FORBIDDEN if forbid is None else forbid
+
+    failed = False
+    for module in modules:
+        module_budget = budget if budget is not None else DEFAULT_BUDGETS.get(module, 1.0)
+        seconds, imported = module_import_time(module, repeats)
+        forbidden = sorted(
+            {name.split(".")[0] for name in imported} & set(forbid)
+        )
+        status = "ok" if seconds <= module_budget and not forbidden else "FAIL"
+        print(f"{status:4} {module}: {seconds:.3f}s (budget {module_budget:.3f}s)")
+        if forbidden:
+            print(f"     imports forbidden modules: {', '.join(forbidden)}")
+        failed |= status == "FAIL"
+
+    if failed:
+        raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    app()
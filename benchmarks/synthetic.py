@@ -0,0 +1,407 @@
+"""
+Generates synthetic CMT catalogs for benchmarking.
+
+The catalogs have the same columns as CMT_solutions.csv, with random but
+physically consistent focal mechanisms (both nodal planes, moment tensor and
+principal axes) and events located within New Zealand bounds. Everything is
+vectorised with NumPy so catalogs of a million events are quick to generate.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from shapely.geometry import LineString
+
+# Bounds of the synthetic events
+NZ_LATITUDE_BOUNDS = (-48.0, -34.0)
+NZ_LONGITUDE_BOUNDS = (165.0, 179.9)
+START_DATE = np.datetime64("1990-01-01T00:00:00", "s")
+END_DATE = np.datetime64("2026-01-01T00:00:00", "s")
+
+
+def _fault_normal_and_slip(
+    strike: np.ndarray, dip: np.ndarray, rake: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the fault normal and slip vectors of nodal planes.
+
+    Parameters
+    ----------
+    strike : np.ndarray
+        Strike angles in degrees.
+    dip : np.ndarray
+        Dip angles in degrees.
+    rake : np.ndarray
+        Rake angles in degrees.
+
+    Returns
+    -------
+    np.ndarray
+        (n, 3) fault normal vectors in north, east, down coordinates.
+    np.ndarray
+        (n, 3) slip vectors in north, east, down coordinates.
+    """
+    phi, delta, lam = np.radians(strike), np.radians(dip), np.radians(rake)
+    normal = np.stack(
+        [-np.sin(delta) * np.sin(phi), np.sin(delta) * np.cos(phi), -np.cos(delta)],
+        axis=1,
+    )
+    slip = np.stack(
+        [
+            np.cos(lam) * np.cos(phi) + np.cos(delta) * np.sin(lam) * np.sin(phi),
+            np.cos(lam) * np.sin(phi) - np.cos(delta) * np.sin(lam) * np.cos(phi),
+            -np.sin(lam) * np.sin(delta),
+        ],
+        axis=1,
+    )
+    return normal, slip
+
+
+def auxiliary_planes(
+    strike: np.ndarray, dip: np.ndarray, rake: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute the auxiliary nodal planes of many mechanisms at once.
+
+    Parameters
+    ----------
+    strike : np.ndarray
+        Strike angles of the first nodal plane in degrees.
+    dip : np.ndarray
+        Dip angles of the first nodal plane in degrees.
+    rake : np.ndarray
+        Rake angles of the first nodal plane in degrees.
+
+    Returns
+    -------
+    np.ndarray
+        Strike angles of the auxiliary plane in degrees, in [0, 360).
+    np.ndarray
+        Dip angles of the auxiliary plane in degrees.
+    np.ndarray
+        Rake angles of the auxiliary plane in degrees, in [-180, 180].
+    """
+    normal, slip = _fault_normal_and_slip(strike, dip, rake)
+    # The slip vector is the normal of the auxiliary plane and vice versa,
+    # flipped so the normal points upwards
+    flip = np.where(slip[:, 2] > 0, -1.0, 1.0)[:, None]
+    aux_normal = slip * flip
+    aux_slip = normal * flip
+
+    dip2 = np.degrees(np.arccos(np.clip(-aux_normal[:, 2], -1.0, 1.0)))
+    strike2 = np.degrees(np.arctan2(-aux_normal[:, 0], aux_normal[:, 1])) % 360.0
+    phi2 = np.radians(strike2)
+    sin_dip2 = np.maximum(np.sin(np.radians(dip2)), 1e-12)
+    rake2 = np.degrees(
+        np.arctan2(
+            -aux_slip[:, 2] / sin_dip2,
+            aux_slip[:, 0] * np.cos(phi2) + aux_slip[:, 1] * np.sin(phi2),
+        )
+    )
+    return strike2, dip2, rake2
+
+
+def moment_tensors(
+    strike: np.ndarray, dip: np.ndarray, rake: np.ndarray, moment: np.ndarray
+) -> np.ndarray:
+    """
+    Compute double couple moment tensors (Aki & Richards convention).
+
+    Parameters
+    ----------
+    strike : np.ndarray
+        Strike angles in degrees.
+    dip : np.ndarray
+        Dip angles in degrees.
+    rake : np.ndarray
+        Rake angles in degrees.
+    moment : np.ndarray
+        Scalar moments.
+
+    Returns
+    -------
+    np.ndarray
+        (n, 3, 3) moment tensors in north, east, down coordinates.
+    """
+    phi, delta, lam = np.radians(strike), np.radians(dip), np.radians(rake)
+    mxx = -moment * (
+        np.sin(delta) * np.cos(lam) * np.sin(2 * phi)
+        + np.sin(2 * delta) * np.sin(lam) * np.sin(phi) ** 2
+    )
+    mxy = moment * (
+        np.sin(delta) * np.cos(lam) * np.cos(2 * phi)
+        + 0.5 * np.sin(2 * delta) * np.sin(lam) * np.sin(2 * phi)
+    )
+    mxz = -moment * (
+        np.cos(delta) * np.cos(lam) * np.cos(phi)
+        + np.cos(2 * delta) * np.sin(lam) * np.sin(phi)
+    )
+    myy = moment * (
+        np.sin(delta) * np.cos(lam) * np.sin(2 * phi)
+        - np.sin(2 * delta) * np.sin(lam) * np.cos(phi) ** 2
+    )
+    myz = -moment * (
+        np.cos(delta) * np.cos(lam) * np.sin(phi)
+        - np.cos(2 * delta) * np.sin(lam) * np.cos(phi)
+    )
+    mzz = moment * np.sin(2 * delta) * np.sin(lam)
+    return np.stack(
+        [
+            np.stack([mxx, mxy, mxz], axis=1),
+            np.stack([mxy, myy, myz], axis=1),
+            np.stack([mxz, myz, mzz], axis=1),
+        ],
+        axis=1,
+    )
+
+
+def _random_dates(rng: np.random.Generator, n_events: int) -> np.ndarray:
+    """
+    Generate random event times.
+
+    Parameters
+    ----------
+    rng : np.random.Generator
+        The random number generator.
+    n_events : int
+        Number of times to generate.
+
+    Returns
+    -------
+    np.ndarray
+        Sorted datetime64[s] event times between START_DATE and END_DATE.
+    """
+    span = (END_DATE - START_DATE).astype(np.int64)
+    return np.sort(START_DATE + rng.integers(0, span, n_events).astype("timedelta64[s]"))
+
+
+def synthetic_cmt_catalog(n_events: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate a synthetic catalog with the columns of CMT_solutions.csv.
+
+    Parameters
+    ----------
+    n_events : int
+        Number of events to generate.
+    seed : int, optional
+        Seed for the random number generator.
+
+    Returns
+    -------
+    pd.DataFrame
+        The synthetic catalog.
+    """
+    rng = np.random.default_rng(seed)
+
+    strike1 = rng.uniform(0.0, 360.0, n_events)
+    dip1 = rng.uniform(5.0, 90.0, n_events)
+    rake1 = rng.uniform(-180.0, 180.0, n_events)
+    strike2, dip2, rake2 = auxiliary_planes(strike1, dip1, rake1)
+
+    # Gutenberg-Richter magnitudes with b = 1
+    mw = np.minimum(3.5 + rng.exponential(1 / np.log(10), n_events), 8.5).round(1)
+    # Scalar moment in dyne-cm, tensor components scaled as in the GeoNet catalog
+    moment = 10 ** (1.5 * mw + 16.1)
+    tensors = moment_tensors(strike1, dip1, rake1, moment / 1e20)
+
+    # Principal axes, eigenvalues in ascending order so P, N, T
+    eigenvalues, eigenvectors = np.linalg.eigh(tensors)
+    # Axes point downwards, plunge is the angle below horizontal
+    eigenvectors = eigenvectors * np.where(eigenvectors[:, 2:3, :] < 0, -1.0, 1.0)
+    plunge = np.degrees(np.arcsin(np.clip(eigenvectors[:, 2, :], -1.0, 1.0)))
+    azimuth = np.degrees(np.arctan2(eigenvectors[:, 1, :], eigenvectors[:, 0, :])) % 360.0
+
+    dates = _random_dates(rng, n_events)
+    years = dates.astype("datetime64[Y]").astype(int) + 1970
+    public_ids = [f"{year}p{index:07d}" for index, year in enumerate(years)]
+
+    return pd.DataFrame(
+        {
+            "PublicID": public_ids,
+            "Date": pd.to_datetime(dates).strftime("%Y%m%d%H%M%S").astype(np.int64),
+            "Latitude": rng.uniform(*NZ_LATITUDE_BOUNDS, n_events).round(4),
+            "Longitude": rng.uniform(*NZ_LONGITUDE_BOUNDS, n_events).round(4),
+            "strike1": strike1.round(),
+            "dip1": dip1.round(),
+            "rake1": rake1.round(),
+            "strike2": strike2.round(),
+            "dip2": dip2.round(),
+            "rake2": rake2.round(),
+            "ML": (mw + rng.normal(0.0, 0.2, n_events)).round(1),
+            "Mw": mw,
+            "Mo": moment,
+            "CD": np.minimum(rng.exponential(30.0, n_events), 600.0).round(),
+            "NS": rng.integers(3, 60, n_events),
+            "DC": rng.integers(50, 101, n_events),
+            "Mxx": tensors[:, 0, 0].round(2),
+            "Mxy": tensors[:, 0, 1].round(2),
+            "Mxz": tensors[:, 0, 2].round(2),
+            "Myy": tensors[:, 1, 1].round(2),
+            "Myz": tensors[:, 1, 2].round(2),
+            "Mzz": tensors[:, 2, 2].round(2),
+            "VR": rng.integers(40, 96, n_events),
+            "Tva": eigenvalues[:, 2].round(2),
+            "Tpl": plunge[:, 2].round(),
+            "Taz": azimuth[:, 2].round(),
+            "Nva": eigenvalues[:, 1].round(2),
+            "Npl": plunge[:, 1].round(),
+            "Naz": azimuth[:, 1].round(),
+            "Pva": eigenvalues[:, 0].round(2),
+            "Ppl": plunge[:, 0].round(),
+            "Paz": azimuth[:, 0].round(),
+            "Method": 1,
+            "reviewed": rng.random(n_events) < 0.3,
+            "reviewer": np.where(rng.random(n_events) < 0.3, "Felipe", ""),
+            "source": np.where(rng.random(n_events) < 0.1, "John Townend", "GeoNet"),
+        }
+    )
+
+
+def write_synthetic_cmt_catalog(path: Path, n_events: int, seed: int = 0) -> Path:
+    """
+    Write a synthetic catalog to a CSV file.
+
+    Parameters
+    ----------
+    path : Path
+        The CSV file to write.
+    n_events : int
+        Number of events to generate.
+    seed : int, optional
+        Seed for the random number generator.
+
+    Returns
+    -------
+    Path
+        The path of the written file.
+    """
+    synthetic_cmt_catalog(n_events, seed).to_csv(path, index=False)
+    return path
+
+
+def synthetic_matching_catalogs(
+    n_events: int, n_geonet_events: int, seed: int = 0
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Generate John Townend and GeoNet catalogs for the event matching.
+
+    Every John Townend event has a GeoNet counterpart a few seconds and a
+    small distance away, the remaining GeoNet events are unrelated.
+
+    Parameters
+    ----------
+    n_events : int
+        Number of John Townend events.
+    n_geonet_events : int
+        Number of GeoNet events, at least `n_events`.
+    seed : int, optional
+        Seed for the random number generator.
+
+    Returns
+    -------
+    pd.DataFrame
+        John Townend events with date_dt, lat.geo, lon.geo and z.geo columns.
+    pd.DataFrame
+        GeoNet events with origintime, latitude, longitude, depth and publicid
+        columns, sorted by origintime as returned by the GeoNet download.
+    """
+    rng = np.random.default_rng(seed)
+    geonet_times = _random_dates(rng, n_geonet_events)
+    geonet_df = pd.DataFrame(
+        {
+            "publicid": [f"{index:07d}" for index in range(n_geonet_events)],
+            "origintime": pd.to_datetime(geonet_times),
+            "latitude": rng.uniform(*NZ_LATITUDE_BOUNDS, n_geonet_events),
+            "longitude": rng.uniform(*NZ_LONGITUDE_BOUNDS, n_geonet_events),
+            "depth": rng.exponential(30.0, n_geonet_events),
+        }
+    )
+
+    matched = np.sort(rng.choice(n_geonet_events, n_events, replace=False))
+    john_townend_df = pd.DataFrame(
+        {
+            "date_dt": geonet_df["origintime"].to_numpy()[matched]
+            + rng.integers(-15, 16, n_events).astype("timedelta64[s]"),
+            "lat.geo": geonet_df["latitude"].to_numpy()[matched]
+            + rng.uniform(-0.5, 0.5, n_events),
+            "lon.geo": geonet_df["longitude"].to_numpy()[matched]
+            + rng.uniform(-0.5, 0.5, n_events),
+            "z.geo": geonet_df["depth"].to_numpy()[matched]
+            + rng.uniform(-0.05, 0.05, n_events),
+        }
+    )
+    return john_townend_df, geonet_df
+
+
+def synthetic_fault_traces(n_faults: int, points_per_trace: int = 20, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate fault traces shaped like the community fault model.
+
+    Parameters
+    ----------
+    n_faults : int
+        Number of faults to generate.
+    points_per_trace : int, optional
+        Number of points along each trace.
+    seed : int, optional
+        Seed for the random number generator.
+
+    Returns
+    -------
+    pd.DataFrame
+        Faults with trace and geometry columns holding the same LineStrings,
+        and name, dip_range, dip_dir and rake_range columns.
+    """
+    rng = np.random.default_rng(seed)
+    starts = np.stack(
+        [
+            rng.uniform(*NZ_LONGITUDE_BOUNDS, n_faults),
+            rng.uniform(*NZ_LATITUDE_BOUNDS, n_faults),
+        ],
+        axis=1,
+    )
+    steps = rng.normal(0.0, 0.05, (n_faults, points_per_trace, 2))
+    coords = starts[:, None, :] + np.cumsum(steps, axis=1)
+    # Wrap longitudes so traces near the dateline cross it
+    coords[:, :, 0] = (coords[:, :, 0] + 180.0) % 360.0 - 180.0
+    traces = [LineString(trace) for trace in coords]
+    return pd.DataFrame(
+        {
+            "name": [f"Fault {index}" for index in range(n_faults)],
+            "trace": traces,
+            "geometry": traces,
+            "dip_range": [(40, 60)] * n_faults,
+            "dip_dir": rng.choice(["N", "E", "S", "W"], n_faults),
+            "rake_range": [(80, 100)] * n_faults,
+        }
+    )
+
+
+def synthetic_plane_corners(n_planes: int, seed: int = 0) -> np.ndarray:
+    """
+    Generate rectangular nodal plane corners within New Zealand.
+
+    Parameters
+    ----------
+    n_planes : int
+        Number of planes to generate.
+    seed : int, optional
+        Seed for the random number generator.
+
+    Returns
+    -------
+    np.ndarray
+        (n, 4, 2) array of (lat, lon) corners for each plane.
+    """
+    rng = np.random.default_rng(seed)
+    centres = np.stack(
+        [
+            rng.uniform(*NZ_LATITUDE_BOUNDS, n_planes),
+            rng.uniform(*NZ_LONGITUDE_BOUNDS, n_planes),
+        ],
+        axis=1,
+    )
+    half_sizes = rng.uniform(0.01, 0.5, (n_planes, 2))
+    signs = np.array([[-1, -1], [-1, 1], [1, 1], [1, -1]])
+    return centres[:, None, :] + signs[None, :, :] * half_sizes[:, None, :]
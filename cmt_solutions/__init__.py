@@ -0,0 +1,42 @@
+"""
+Access to CMT solutions for seismic events in New Zealand.
+
+The commonly used functions and classes are available from the top level
+package. Submodules are only imported when one of these names is first
+accessed, so importing the package itself does not load pandas or any of the
+heavier optional dependencies.
+"""
+
+import importlib
+
+# Mapping of public name to the submodule defining it
+_LAZY_ATTRIBUTES = {
+    "CMT_DATA_PATH": "cmt_data",
+    "JOHN_TOWNEND_CMT_DATA_PATH": "cmt_data",
+    "get_cmt_data": "cmt_data",
+    "iter_cmt_data": "cmt_data",
+    "CMTCatalog": "catalog",
+    "CMTEvent": "catalog",
+    "CatalogClient": "client",
+    "CatalogIndex": "query",
+    "SnapshotStore": "snapshot",
+    "add_conjugate_nodal_planes": "nodal_plane",
+    "conjugate_nodal_plane": "nodal_plane",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str):
+    """Import the submodule defining a public name on first access."""
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    """List the module attributes, including the lazily imported names."""
+    return sorted(list(globals()) + __all__)
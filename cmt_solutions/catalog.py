@@ -0,0 +1,465 @@
+"""
+Compact, array-backed representation of a CMT catalog.
+
+A `CMTCatalog` stores each column of the catalog as a contiguous NumPy array
+with the narrowest sensible dtype, rather than as a wide pandas DataFrame of
+object strings and float64 values. Angles and the VR/DC percentages are
+stored as float32, the string columns with few distinct values (source,
+reviewer, Method) are stored as categorical codes and PublicIDs are interned.
+Magnitudes, depths, coordinates and the moment tensor components keep float64,
+as their values need more than float32's seven significant digits or are
+compared against exact thresholds. Slicing a catalog returns a view
+onto the same arrays and single events are exposed through lightweight
+`CMTEvent` records.
+"""
+
+import sys
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+from cmt_solutions import cmt_data
+
+# Angle columns (strike, dip, rake, plunge and azimuth) stored as float32
+ANGLE_COLUMNS = (
+    "strike1", "dip1", "rake1",
+    "strike2", "dip2", "rake2",
+    "Tpl", "Taz", "Npl", "Naz", "Ppl", "Paz",
+)
+# Other low precision columns stored as float32. The magnitude and depth
+# columns stay float64 so filters on them match the CSV values exactly
+FLOAT32_COLUMNS = ("VR", "DC")
+# String columns with few distinct values stored as categorical codes
+CATEGORICAL_COLUMNS = ("source", "reviewer", "Method")
+# Columns stored as booleans
+BOOL_COLUMNS = ("reviewed",)
+
+
+def _to_bool(values: pd.Series) -> np.ndarray:
+    """
+    Convert a column of mixed boolean representations to a boolean array.
+
+    Parameters
+    ----------
+    values : pd.Series
+        Column containing booleans, 0/1 or strings such as "True"/"FALSE".
+
+    Returns
+    -------
+    np.ndarray
+        Boolean array, with missing values as False.
+    """
+    if pd.api.types.is_bool_dtype(values):
+        return values.fillna(False).to_numpy(dtype=bool)
+    if pd.api.types.is_numeric_dtype(values):
+        return values.fillna(0).to_numpy().astype(bool)
+    return (
+        values.astype(str).str.strip().str.lower().isin({"true", "t", "1", "yes", "y"})
+    ).to_numpy()
+
+
+class CMTEvent:
+    """
+    Lightweight record for a single event of a `CMTCatalog`.
+
+    Values are read from the catalog arrays on access, so creating an event
+    does not copy any data. Columns can be accessed as attributes
+    (``event.Mw``) or by name (``event["Mw"]``).
+    """
+
+    __slots__ = ("_catalog", "_index")
+
+    def __init__(self, catalog: "CMTCatalog", index: int):
+        """Create a record for row `index` of `catalog`."""
+        self._catalog = catalog
+        self._index = index
+
+    def __getattr__(self, name: str):
+        """Return the value of column `name` for this event."""
+        # Only reached for private names when the slots are unset, e.g. while
+        # copy or pickle rebuild the record, where looking them up would recurse
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self._catalog.column_value(name, self._index)
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __getitem__(self, name: str):
+        """Return the value of column `name` for this event."""
+        return self._catalog.column_value(name, self._index)
+
+    def __reduce__(self):
+        """Pickle the event as its catalog and row."""
+        return CMTEvent, (self._catalog, self._index)
+
+    def __repr__(self):
+        """Return a short description of the event."""
+        return f"CMTEvent(PublicID={self['PublicID']!r})"
+
+    def to_dict(self) -> dict:
+        """
+        Return the event as a dictionary of column name to value.
+
+        Returns
+        -------
+        dict
+            The values of every column for this event.
+        """
+        return {
+            column: self._catalog.column_value(column, self._index)
+            for column in self._catalog.columns
+        }
+
+
+class CMTCatalog:
+    """
+    Column-oriented CMT catalog backed by NumPy arrays.
+
+    Categorical columns are held as a pair of (codes, categories) arrays, all
+    other columns as a single array. Use `from_dataframe` or `from_csv` to
+    construct a catalog.
+
+    Parameters
+    ----------
+    arrays : dict[str, np.ndarray]
+        Mapping of column name to array of values, all of the same length.
+    categories : dict[str, np.ndarray], optional
+        Mapping of categorical column name to its categories, in which case
+        the array in `arrays` holds the integer codes (-1 for missing).
+    """
+
+    __slots__ = ("_arrays", "_categories", "_id_index")
+
+    def __init__(
+        self,
+        arrays: dict[str, np.ndarray],
+        categories: dict[str, np.ndarray] = None,
+    ):
+        """Create a catalog from its column arrays."""
+        lengths = {len(array) for array in arrays.values()}
+        if len(lengths) > 1:
+            raise ValueError("All catalog columns must have the same length.")
+        self._arrays = arrays
+        self._categories = categories or {}
+        self._id_index = None
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "CMTCatalog":
+        """
+        Build a catalog from a CMT DataFrame.
+
+        Numeric columns that already have the target dtype are used without
+        copying. A DataFrame indexed by PublicID (as in the reviewer) is also
+        accepted.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            DataFrame with the columns of CMT_solutions.csv, or a subset of them.
+
+        Returns
+        -------
+        CMTCatalog
+            The catalog holding the DataFrame contents.
+        """
+        if df.index.name == "PublicID":
+            df = df.reset_index()
+
+        arrays = {}
+        categories = {}
+        for column in df.columns:
+            values = df[column]
+            if column == "PublicID":
+                arrays[column] = np.array(
+                    [
+                        sys.intern(value) if isinstance(value, str) else value
+                        for value in values.astype(object)
+                    ],
+                    dtype=object,
+                )
+            elif column in CATEGORICAL_COLUMNS:
+                categorical = pd.Categorical(values)
+                arrays[column] = categorical.codes
+                categories[column] = np.asarray(categorical.categories, dtype=object)
+            elif column in BOOL_COLUMNS:
+                arrays[column] = _to_bool(values)
+            elif column in ANGLE_COLUMNS or column in FLOAT32_COLUMNS:
+                arrays[column] = values.to_numpy(dtype=np.float32)
+            elif column == "Date" or pd.api.types.is_numeric_dtype(values):
+                arrays[column] = values.to_numpy()
+            else:
+                arrays[column] = values.to_numpy(dtype=object)
+        return cls(arrays, categories)
+
+    @classmethod
+    def from_csv(cls, path: Path = cmt_data.CMT_DATA_PATH, **kwargs) -> "CMTCatalog":
+        """
+        Load a catalog from a CSV file, one chunk at a time.
+
+        Each chunk is converted to the compact representation as it is read,
+        so the full catalog is never held as a DataFrame.
+
+        Parameters
+        ----------
+        path : Path, optional
+            Path to the catalog CSV file, by default the CMT solutions dataset.
+        **kwargs
+            Additional keyword arguments (columns, filters, chunksize) passed
+            to `cmt_data.iter_cmt_data`.
+
+        Returns
+        -------
+        CMTCatalog
+            The loaded catalog.
+        """
+        return cls.concat(
+            cls.from_dataframe(chunk)
+            for chunk in cmt_data.iter_cmt_data(path, **kwargs)
+        )
+
+    @classmethod
+    def concat(cls, catalogs: Iterable["CMTCatalog"]) -> "CMTCatalog":
+        """
+        Concatenate catalogs with the same columns into a single catalog.
+
+        Parameters
+        ----------
+        catalogs : Iterable[CMTCatalog]
+            The catalogs to concatenate.
+
+        Returns
+        -------
+        CMTCatalog
+            A new catalog holding the events of every catalog in order.
+        """
+        catalogs = list(catalogs)
+        if not catalogs:
+            return cls({})
+        columns = catalogs[0].columns
+        arrays = {}
+        categories = {}
+        for column in columns:
+            if column in catalogs[0]._categories:
+                categorical = pd.api.types.union_categoricals(
+                    [catalog.categorical(column) for catalog in catalogs]
+                )
+                arrays[column] = categorical.codes
+                categories[column] = np.asarray(categorical.categories, dtype=object)
+            else:
+                arrays[column] = np.concatenate(
+                    [catalog._arrays[column] for catalog in catalogs]
+                )
+        return cls(arrays, categories)
+
+    @property
+    def columns(self) -> list[str]:
+        """list[str]: The column names of the catalog."""
+        return list(self._arrays)
+
+    @property
+    def nbytes(self) -> int:
+        """int: Approximate memory used by the catalog arrays in bytes."""
+        total = sum(array.nbytes for array in self._arrays.values())
+        total += sum(array.nbytes for array in self._categories.values())
+        # Object arrays only store pointers, count the interned strings once
+        if "PublicID" in self._arrays:
+            total += sum(
+                sys.getsizeof(value) for value in set(self._arrays["PublicID"])
+            )
+        return total
+
+    def __len__(self):
+        """Return the number of events."""
+        return len(next(iter(self._arrays.values()), ()))
+
+    def __contains__(self, event_id: str):
+        """Check whether an event with this PublicID is in the catalog."""
+        return event_id in self._public_id_index()
+
+    def __iter__(self) -> Iterator[CMTEvent]:
+        """Iterate over the events of the catalog."""
+        return (CMTEvent(self, index) for index in range(len(self)))
+
+    def __getitem__(self, key: Union[int, slice, np.ndarray, Sequence]):
+        """Return an event by position, or a catalog of the selected events."""
+        if isinstance(key, (int, np.integer)):
+            if key < 0:
+                key += len(self)
+            if not 0 <= key < len(self):
+                raise IndexError("Catalog index out of range.")
+            return CMTEvent(self, int(key))
+        # Basic slices return views onto the same arrays, boolean masks and
+        # index arrays return copies (as for NumPy arrays)
+        if not isinstance(key, slice):
+            key = np.asarray(key)
+        return CMTCatalog(
+            {column: array[key] for column, array in self._arrays.items()},
+            self._categories,
+        )
+
+    def __repr__(self):
+        """Return a short description of the catalog."""
+        return f"CMTCatalog({len(self)} events, {len(self._arrays)} columns)"
+
+    def _public_id_index(self) -> dict[str, int]:
+        """
+        Return the mapping of PublicID to row, building it on first use.
+
+        Returns
+        -------
+        dict[str, int]
+            Mapping of PublicID to the row index of the event.
+        """
+        if self._id_index is None:
+            self._id_index = {
+                public_id: index
+                for index, public_id in enumerate(self._arrays["PublicID"])
+            }
+        return self._id_index
+
+    def get_event(self, event_id: str) -> CMTEvent:
+        """
+        Look up a single event by its PublicID.
+
+        Parameters
+        ----------
+        event_id : str
+            The PublicID of the event.
+
+        Returns
+        -------
+        CMTEvent
+            The event record.
+        """
+        try:
+            return CMTEvent(self, self._public_id_index()[event_id])
+        except KeyError:
+            raise ValueError(f"Event ID {event_id} not found in CMT catalog.") from None
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Return the values of a column as an array.
+
+        Categorical columns are decoded to an object array, use `categorical`
+        to access them without decoding.
+
+        Parameters
+        ----------
+        name : str
+            The column name.
+
+        Returns
+        -------
+        np.ndarray
+            The column values. For non-categorical columns this is the
+            underlying array, not a copy, so float32 columns are returned
+            as stored.
+        """
+        if name in self._categories:
+            return np.asarray(self.categorical(name), dtype=object)
+        return self._arrays[name]
+
+    def categorical(self, name: str) -> pd.Categorical:
+        """
+        Return a categorical column as a `pd.Categorical`.
+
+        Parameters
+        ----------
+        name : str
+            The name of a categorical column.
+
+        Returns
+        -------
+        pd.Categorical
+            The column as a categorical sharing the stored codes.
+        """
+        return pd.Categorical.from_codes(
+            self._arrays[name],
+            categories=pd.Index(self._categories[name], dtype=object),
+            validate=False,
+        )
+
+    def epoch_times(self) -> np.ndarray:
+        """
+        Return the event times as seconds since the Unix epoch.
+
+        The Date column is kept in its original YYYYMMDDhhmmss integer form so
+        that it round trips exactly. As many dates are only precise to the
+        month (e.g. 20030800000000), a zero month or day is taken as the first.
+
+        Returns
+        -------
+        np.ndarray
+            int64 array of event times in seconds since 1970-01-01.
+        """
+        dates = self._arrays["Date"].astype(np.int64)
+        times = pd.to_datetime(
+            pd.DataFrame(
+                {
+                    "year": dates // 10**10,
+                    "month": np.maximum(dates // 10**8 % 100, 1),
+                    "day": np.maximum(dates // 10**6 % 100, 1),
+                    "hour": dates // 10**4 % 100,
+                    "minute": dates // 10**2 % 100,
+                    "second": dates % 100,
+                }
+            )
+        )
+        return times.to_numpy(dtype="datetime64[s]").astype(np.int64)
+
+    def column_value(self, name: str, index: int):
+        """
+        Return the value of a column for a single row.
+
+        Parameters
+        ----------
+        name : str
+            The column name.
+        index : int
+            The row index.
+
+        Returns
+        -------
+        Any
+            The value, with categorical columns decoded and missing
+            categorical values as None. float32 values are decoded through
+            their shortest representation, so a stored 35.7 is returned as
+            35.7 rather than 35.70000076293945.
+        """
+        value = self._arrays[name][index]
+        if name in self._categories:
+            return None if value < 0 else self._categories[name][value]
+        if isinstance(value, np.float32):
+            return float(str(value))
+        return value.item() if isinstance(value, np.generic) else value
+
+    def to_dataframe(self, index: str = None) -> pd.DataFrame:
+        """
+        Convert the catalog to a pandas DataFrame.
+
+        The numeric columns are passed to pandas without copying, so the
+        DataFrame shares memory with the catalog, float32 columns keep their
+        dtype and categorical columns are returned with a categorical dtype.
+
+        Parameters
+        ----------
+        index : str, optional
+            Column to use as the DataFrame index, e.g. "PublicID".
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with one column per catalog column.
+        """
+        data = {
+            column: self.categorical(column) if column in self._categories else array
+            for column, array in self._arrays.items()
+        }
+        df = pd.DataFrame(data, copy=False)
+        if index is not None:
+            df = df.set_index(index)
+        return df
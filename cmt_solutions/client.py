@@ -0,0 +1,243 @@
+"""
+Thin client for the local CMT catalog service.
+
+The service (`scripts/serve_cmt_catalog.py`) keeps the catalog and its
+indexes loaded in a single long-running process, so tools querying it do not
+each parse `CMT_solutions.csv`. When the service is not running the client
+falls back to loading and indexing the file itself, so callers do not need to
+know whether it is available.
+
+Example
+-------
+>>> client = CatalogClient()
+>>> df = client.query(min_mw=5.0, bbox=(171.0, -44.5, 174.0, -42.0))
+>>> event = client.get_event("2016p858000")
+"""
+
+import http.client
+import json
+import os
+import socket
+from collections.abc import Sequence
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import quote, urlencode, urlsplit
+
+import pandas as pd
+
+from cmt_solutions import cmt_data
+
+if TYPE_CHECKING:
+    from cmt_solutions.query import CatalogIndex
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Environment variables overriding the address of the service
+URL_ENVIRONMENT_VARIABLE = "CMT_CATALOG_URL"
+SOCKET_ENVIRONMENT_VARIABLE = "CMT_CATALOG_SOCKET"
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """An HTTP connection over a Unix domain socket."""
+
+    def __init__(self, socket_path: Path, timeout: float):
+        """Create a connection to the service listening on `socket_path`."""
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = str(socket_path)
+
+    def connect(self):
+        """Connect to the Unix domain socket."""
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class CatalogClient:
+    """
+    Query the CMT catalog through the local catalog service.
+
+    Parameters
+    ----------
+    url : str, optional
+        Base URL of the service, by default the value of the CMT_CATALOG_URL
+        environment variable or http://127.0.0.1:8765.
+    socket_path : Path, optional
+        Unix socket the service listens on, used instead of `url`. By default
+        the value of the CMT_CATALOG_SOCKET environment variable, if set.
+    path : Path, optional
+        Catalog CSV file loaded directly when the service is not running, by
+        default the CMT solutions dataset.
+    timeout : float, optional
+        Timeout in seconds for requests to the service.
+    """
+
+    def __init__(
+        self,
+        url: str = None,
+        socket_path: Path = None,
+        path: Path = cmt_data.CMT_DATA_PATH,
+        timeout: float = 5.0,
+    ):
+        """Create a client for the service at `url` or `socket_path`."""
+        self.url = url or os.environ.get(
+            URL_ENVIRONMENT_VARIABLE, f"http://{DEFAULT_HOST}:{DEFAULT_PORT}"
+        )
+        socket_path = socket_path or os.environ.get(SOCKET_ENVIRONMENT_VARIABLE)
+        self.socket_path = Path(socket_path) if socket_path else None
+        self.path = Path(path)
+        self.timeout = timeout
+        self._local_index = None
+
+    def _connection(self) -> http.client.HTTPConnection:
+        """
+        Open a connection to the service.
+
+        Returns
+        -------
+        http.client.HTTPConnection
+            An unconnected HTTP connection to the service.
+        """
+        if self.socket_path is not None:
+            return _UnixHTTPConnection(self.socket_path, self.timeout)
+        parts = urlsplit(self.url)
+        return http.client.HTTPConnection(
+            parts.hostname, parts.port or DEFAULT_PORT, timeout=self.timeout
+        )
+
+    def _request(self, path: str, params: dict = None):
+        """
+        Send a GET request to the service.
+
+        Parameters
+        ----------
+        path : str
+            The request path, e.g. "/events".
+        params : dict, optional
+            Query parameters, None values are omitted.
+
+        Returns
+        -------
+        Any
+            The decoded JSON response, or None if the service is not running.
+        """
+        params = {key: value for key, value in (params or {}).items() if value is not None}
+        target = path + (f"?{urlencode(params)}" if params else "")
+        connection = self._connection()
+        try:
+            connection.request("GET", target)
+            response = connection.getresponse()
+            body = json.loads(response.read())
+        except OSError:
+            # Connection refused, missing socket or timeout: no service running
+            return None
+        finally:
+            connection.close()
+        if response.status != 200:
+            raise ValueError(body.get("error", f"Catalog service returned {response.status}"))
+        return body
+
+    def local_index(self) -> "CatalogIndex":
+        """
+        Return the index of the catalog file, loading it on first use.
+
+        Returns
+        -------
+        CatalogIndex
+            The catalog index used when the service is not running.
+        """
+        if self._local_index is None:
+            # Imported here so the client stays cheap to import when the service is used
+            from cmt_solutions.query import CatalogIndex
+
+            self._local_index = CatalogIndex.from_csv(self.path)
+        return self._local_index
+
+    def is_available(self) -> bool:
+        """
+        Check whether the catalog service is running.
+
+        Returns
+        -------
+        bool
+            True if the service answered a health check.
+        """
+        return self._request("/health") is not None
+
+    def get_event(self, event_id: str) -> dict:
+        """
+        Look up a single event by its PublicID.
+
+        Parameters
+        ----------
+        event_id : str
+            The PublicID of the event.
+
+        Returns
+        -------
+        dict
+            The values of every column for the event, with missing values as None.
+        """
+        event = self._request("/events/" + quote(event_id, safe=""))
+        if event is not None:
+            return event
+        index = self.local_index()
+        return index.records([index.event_row(event_id)])[0]
+
+    def query(
+        self,
+        min_mw: float = None,
+        max_mw: float = None,
+        start_date: datetime = None,
+        end_date: datetime = None,
+        bbox: tuple[float, float, float, float] = None,
+        columns: Sequence[str] = None,
+        limit: int = None,
+    ) -> pd.DataFrame:
+        """
+        Find the events matching magnitude, time and bounding box filters.
+
+        The filters have the same meaning as in `cmt_data.iter_cmt_data`.
+
+        Parameters
+        ----------
+        min_mw : float, optional
+            Minimum magnitude (inclusive).
+        max_mw : float, optional
+            Maximum magnitude (inclusive).
+        start_date : datetime, optional
+            Earliest event time (inclusive).
+        end_date : datetime, optional
+            Latest event time (inclusive).
+        bbox : tuple[float, float, float, float], optional
+            Bounding box as (min_lon, min_lat, max_lon, max_lat). If min_lon is
+            greater than max_lon the box is taken to cross the dateline.
+        columns : Sequence[str], optional
+            Columns to return, by default every column.
+        limit : int, optional
+            Maximum number of events to return, the first events in catalog order are kept.
+
+        Returns
+        -------
+        pd.DataFrame
+            The matching events, in catalog order.
+        """
+        response = self._request(
+            "/events",
+            {
+                "min_mw": min_mw,
+                "max_mw": max_mw,
+                "start_date": start_date and start_date.isoformat(),
+                "end_date": end_date and end_date.isoformat(),
+                "bbox": bbox and ",".join(str(value) for value in bbox),
+                "columns": columns and ",".join(columns),
+                "limit": limit,
+            },
+        )
+        if response is not None:
+            events = response["events"]
+        else:
+            index = self.local_index()
+            rows = index.query(min_mw, max_mw, start_date, end_date, bbox)
+            events = index.records(rows[:limit], columns)
+        return pd.DataFrame.from_records(events, columns=columns)
@@ -1,12 +1,20 @@
+from collections.abc import Iterator, Sequence
+from datetime import datetime
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
+from cmt_solutions import profiling
+
 CMT_DATA_PATH = Path(__file__).resolve().parent.parent / "data" / "CMT_solutions.csv"
 JOHN_TOWNEND_CMT_DATA_PATH = (
     Path(__file__).resolve().parent.parent / "data" / "john_townend_np2.csv"
 )
 
+# Format of the Date column in CMT_solutions.csv, e.g. 20030800000000
+CMT_DATE_FORMAT = "%Y%m%d%H%M%S"
+
 
 def get_cmt_data(event_id: str = None) -> pd.DataFrame:
     """
@@ -21,10 +29,142 @@ def get_cmt_data(event_id: str = None) -> pd.DataFrame:
     -------
         pd.DataFrame: DataFrame containing the CMT solutions data / filtered by event ID if provided.
     """
-    cmt_df = pd.read_csv(CMT_DATA_PATH, dtype={"PublicID": str})
+    with profiling.stage("get_cmt_data") as read_stage:
+        cmt_df = pd.read_csv(CMT_DATA_PATH, dtype={"PublicID": str})
+        read_stage.rows = len(cmt_df)
+        read_stage.bytes = CMT_DATA_PATH.stat().st_size
     if event_id is not None:
         cmt_df = cmt_df[cmt_df["PublicID"] == event_id]
         # Check that the event_id exists in the dataframe
         if cmt_df.empty:
             raise ValueError(f"Event ID {event_id} not found in CMT solutions dataset.")
     return cmt_df
+
+
+def iter_cmt_data(
+    path: Path = CMT_DATA_PATH,
+    columns: Sequence[str] = None,
+    min_mw: float = None,
+    max_mw: float = None,
+    start_date: datetime = None,
+    end_date: datetime = None,
+    bbox: tuple[float, float, float, float] = None,
+    chunksize: int = 100_000,
+    dtype: dict = None,
+    magnitude_col: str = "Mw",
+    date_col: str = "Date",
+    date_format: str = CMT_DATE_FORMAT,
+    latitude_col: str = "Latitude",
+    longitude_col: str = "Longitude",
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a CMT catalog from a CSV file in filtered chunks.
+
+    Only the requested columns (plus any needed for filtering) are parsed,
+    and the magnitude, time and bounding box filters are applied to each
+    chunk as it is read, so memory use is bounded by `chunksize` rather
+    than by the size of the catalog. The defaults match the layout of
+    CMT_solutions.csv; the column arguments allow the same filters to be
+    applied to external catalogs such as the John Townend dataset.
+
+    Parameters
+    ----------
+    path : Path, optional
+        Path to the catalog CSV file, by default the CMT solutions dataset.
+    columns : Sequence[str], optional
+        Columns to return. If None, all columns are returned.
+    min_mw : float, optional
+        Minimum magnitude (inclusive) of events to keep.
+    max_mw : float, optional
+        Maximum magnitude (inclusive) of events to keep.
+    start_date : datetime, optional
+        Earliest event time (inclusive) to keep.
+    end_date : datetime, optional
+        Latest event time (inclusive) to keep.
+    bbox : tuple[float, float, float, float], optional
+        Bounding box as (min_lon, min_lat, max_lon, max_lat). If min_lon is
+        greater than max_lon the box is taken to cross the dateline.
+    chunksize : int, optional
+        Number of rows to read per chunk.
+    dtype : dict, optional
+        Column dtypes passed to `pd.read_csv`. PublicID is always read as str
+        when present.
+    magnitude_col : str, optional
+        Name of the magnitude column used by the magnitude filter.
+    date_col : str, optional
+        Name of the date column used by the time filter.
+    date_format : str, optional
+        Format of the date column. Rows whose date cannot be parsed are
+        dropped when a time filter is given. Dates in the default format
+        are compared as integers as they may only be precise to the month.
+    latitude_col : str, optional
+        Name of the latitude column used by the bounding box filter.
+    longitude_col : str, optional
+        Name of the longitude column used by the bounding box filter.
+
+    Yields
+    ------
+    pd.DataFrame
+        Chunk of the catalog containing only the matching rows and requested columns.
+        Chunks where no rows match are skipped.
+    """
+    filter_columns = []
+    if min_mw is not None or max_mw is not None:
+        filter_columns.append(magnitude_col)
+    if start_date is not None or end_date is not None:
+        filter_columns.append(date_col)
+    if bbox is not None:
+        filter_columns.extend([latitude_col, longitude_col])
+
+    usecols = None
+    if columns is not None:
+        columns = list(columns)
+        usecols = columns + [col for col in filter_columns if col not in columns]
+
+    dtype = {"PublicID": str, **(dtype or {})}
+    if usecols is not None:
+        dtype = {col: col_type for col, col_type in dtype.items() if col in usecols}
+
+    reader = pd.read_csv(path, usecols=usecols, dtype=dtype, chunksize=chunksize)
+    with reader:
+        for chunk in reader:
+            mask = np.ones(len(chunk), dtype=bool)
+            if min_mw is not None:
+                mask &= (chunk[magnitude_col] >= min_mw).to_numpy()
+            if max_mw is not None:
+                mask &= (chunk[magnitude_col] <= max_mw).to_numpy()
+            if start_date is not None or end_date is not None:
+                if date_format == CMT_DATE_FORMAT:
+                    # Dates like 20030800000000 have a zero day so cannot be
+                    # parsed, but compare chronologically as integers
+                    dates = pd.to_numeric(chunk[date_col], errors="coerce")
+                    start_key = start_date and int(start_date.strftime(date_format))
+                    end_key = end_date and int(end_date.strftime(date_format))
+                else:
+                    dates = pd.to_datetime(
+                        chunk[date_col].astype(str), format=date_format, errors="coerce"
+                    )
+                    start_key = start_date and pd.Timestamp(start_date)
+                    end_key = end_date and pd.Timestamp(end_date)
+                mask &= dates.notna().to_numpy()
+                if start_key is not None:
+                    mask &= (dates >= start_key).to_numpy()
+                if end_key is not None:
+                    mask &= (dates <= end_key).to_numpy()
+            if bbox is not None:
+                min_lon, min_lat, max_lon, max_lat = bbox
+                lat = chunk[latitude_col]
+                lon = chunk[longitude_col]
+                mask &= ((lat >= min_lat) & (lat <= max_lat)).to_numpy()
+                if min_lon <= max_lon:
+                    mask &= ((lon >= min_lon) & (lon <= max_lon)).to_numpy()
+                else:
+                    # Box crosses the dateline
+                    mask &= ((lon >= min_lon) | (lon <= max_lon)).to_numpy()
+
+            if not mask.any():
+                continue
+            chunk = chunk[mask]
+            if columns is not None:
+                chunk = chunk[columns]
+            yield chunk
@@ -0,0 +1,312 @@
+"""
+Geometry helpers for drawing fault traces and nodal planes on a map.
+"""
+
+import numpy as np
+import pandas as pd
+from shapely.geometry import LineString, MultiLineString
+
+
+def split_dateline_shapely(geom: LineString) -> LineString or MultiLineString:
+    """
+    Split geometry at the dateline (±180°).
+
+    Parameters
+    ----------
+    geom : LineString
+        Input LineString geometry.
+
+    Returns
+    -------
+    LineString or MultiLineString
+        Geometry split at the dateline if necessary.
+    """
+    if geom.is_empty:
+        return geom
+    coords = list(geom.coords)
+    parts = []
+    current_part = [coords[0]]
+    for (lon1, lat1), (lon2, lat2) in zip(coords[:-1], coords[1:]):
+        if abs(lon2 - lon1) > 180:
+            if lon1 > 0:
+                lon_cross = 180
+            else:
+                lon_cross = -180
+            frac = (lon_cross - lon1) / (lon2 - lon1)
+            lat_cross = lat1 + frac * (lat2 - lat1)
+            current_part.append((lon_cross, lat_cross))
+            parts.append(LineString(current_part))
+            lon_cross = -180 if lon_cross == 180 else 180
+            current_part = [(lon_cross, lat_cross), (lon2, lat2)]
+        else:
+            current_part.append((lon2, lat2))
+    parts.append(LineString(current_part))
+    if len(parts) == 1:
+        return parts[0]
+    return MultiLineString(parts)
+
+
+# corners expected as a (4,2) array from `np1.corners[:, :2]` etc.
+def segments_from_corners(corners: list, strike: float, color: list, segments_per_line: int = 20, keep_stride: int = 2):
+    """
+    Create solid and dashed line layers from the corners of a fault plane.
+
+    Parameters
+    ----------
+    corners : list
+        List of four (lon, lat) corner coordinates of the fault plane.
+    strike : float
+        Strike angle of the fault plane in degrees.
+    color : list
+        RGB color for the line layers.
+    segments_per_line : int, optional
+        Number of segments to divide each dashed line into.
+    keep_stride : int, optional
+        Stride for keeping segments to simulate dashes.
+    """
+    corners = np.asarray(corners)
+    if corners.shape != (4, 2):
+        raise ValueError("Expected corners shape (4,2)")
+
+    # Heuristic: lat in [-90,90], lon in [-180,180]
+    col0_in_lon_range = (np.abs(corners[:, 0]) <= 180).all() and (
+        np.abs(corners[:, 0]) > 90
+    ).any()
+    col1_in_lon_range = (np.abs(corners[:, 1]) <= 180).all() and (
+        np.abs(corners[:, 1]) > 90
+    ).any()
+
+    if col0_in_lon_range and not col1_in_lon_range:
+        lon = corners[:, 0]
+        lat = corners[:, 1]
+    elif col1_in_lon_range and not col0_in_lon_range:
+        lon = corners[:, 1]
+        lat = corners[:, 0]
+    else:
+        lat = corners[:, 0]
+        lon = corners[:, 1]
+
+    def row(i: int, j: int):
+        return {
+            "lon1": float(lon[i]),
+            "lat1": float(lat[i]),
+            "lon2": float(lon[j]),
+            "lat2": float(lat[j]),
+            "strike": float(strike),
+        }
+
+    # solid single segment (0->1)
+    solid_df = pd.DataFrame([row(0, 1)])
+
+    # original dashed segments (1->2, 2->3, 3->0)
+    raw_dashed = [row(1, 2), row(2, 3), row(3, 0)]
+
+    # build many short segments and keep every `keep_stride` piece to simulate dashes
+    dash_pieces = []
+    for seg in raw_dashed:
+        lon_a, lat_a = seg["lon1"], seg["lat1"]
+        lon_b, lat_b = seg["lon2"], seg["lat2"]
+        # linear interpolation (simple and usually fine for short lines)
+        lons = np.linspace(lon_a, lon_b, segments_per_line + 1)
+        lats = np.linspace(lat_a, lat_b, segments_per_line + 1)
+        for i in range(segments_per_line):
+            if (i % keep_stride) == 0:
+                dash_pieces.append(
+                    {
+                        "lon1": float(lons[i]),
+                        "lat1": float(lats[i]),
+                        "lon2": float(lons[i + 1]),
+                        "lat2": float(lats[i + 1]),
+                        "strike": seg["strike"],
+                    }
+                )
+
+    dashed_segments_df = pd.DataFrame(dash_pieces)
+
+    # Imported here as pydeck is only needed to build map layers
+    import pydeck as pdk
+
+    solid_layer = pdk.Layer(
+        "LineLayer",
+        data=solid_df,
+        get_source_position=["lon1", "lat1"],
+        get_target_position=["lon2", "lat2"],
+        get_color=color,
+        get_width=3,
+        pickable=False,
+    )
+
+    # dashed simulated via many short visible segments
+    dashed_layer = pdk.Layer(
+        "LineLayer",
+        data=dashed_segments_df,
+        get_source_position=["lon1", "lat1"],
+        get_target_position=["lon2", "lat2"],
+        get_color=color,
+        get_width=3,
+        pickable=False,
+    )
+
+    return solid_layer, dashed_layer
+
+
+def fault_traces_dataframe(fault_gdf: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build a DataFrame of fault trace paths and tooltips for PyDeck.
+
+    Parameters
+    ----------
+    fault_gdf : pd.DataFrame
+        Community fault model (Geo)DataFrame in EPSG:4326 with a ``trace``
+        geometry column and name, dip_range, dip_dir and rake_range columns.
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with one row per trace line, containing the path,
+        fault attributes and an HTML tooltip.
+    """
+    fault_gdf = fault_gdf.copy()
+    fault_gdf["trace"] = fault_gdf["trace"].apply(split_dateline_shapely)
+
+    all_lines = []
+    fault_names = []
+    dip_ranges = []
+    dip_directions = []
+    rake_ranges = []
+    for idx, geom in enumerate(fault_gdf.geometry):
+        if geom.is_empty:
+            continue
+        if geom.geom_type == "LineString":
+            all_lines.append(list(geom.coords))
+            fault_names.append(fault_gdf.iloc[idx]["name"])
+            dip_ranges.append(fault_gdf.iloc[idx]["dip_range"])
+            dip_directions.append(str(fault_gdf.iloc[idx]["dip_dir"]))
+            rake_ranges.append(fault_gdf.iloc[idx]["rake_range"])
+        elif geom.geom_type == "MultiLineString":
+            for part in geom.geoms:
+                all_lines.append(list(part.coords))
+                fault_names.append(fault_gdf.iloc[idx]["name"])
+                dip_ranges.append(fault_gdf.iloc[idx]["dip_range"])
+                dip_directions.append(str(fault_gdf.iloc[idx]["dip_dir"]))
+                rake_ranges.append(fault_gdf.iloc[idx]["rake_range"])
+
+    fault_df = pd.DataFrame(
+        {
+            "path": all_lines,
+            "fault_name": fault_names,
+            "dip_range": dip_ranges,
+            "dip_direction": dip_directions,
+            "rake_range": rake_ranges,
+        }
+    )
+    fault_df["tooltip"] = (
+        "<div style='font-family:Arial,Helvetica,sans-serif;font-size:12px;'>"
+        + "<b>Fault:</b> "
+        + fault_df["fault_name"].astype(str)
+        + "<br><b>Dip:</b> "
+        + fault_df["dip_range"].astype(str)
+        + "<br><b>Dip dir:</b> "
+        + fault_df["dip_direction"].astype(str)
+        + "<br><b>Rake:</b> "
+        + fault_df["rake_range"].astype(str)
+        + "</div>"
+    )
+
+
+    return fault_df
+
+
+def grid_bins(
+    latitude: np.ndarray,
+    longitude: np.ndarray,
+    cell_size_km: float,
+    reviewed: np.ndarray = None,
+    magnitude: np.ndarray = None,
+    reference_latitude: float = -41.0,
+) -> tuple[pd.DataFrame, np.ndarray]:
+    """
+    Aggregate events into square grid cells.
+
+    The grid is fixed in longitude/latitude, with cells of roughly
+    `cell_size_km` at `reference_latitude`, so a cell covers the same area
+    whichever events are binned. Away from the reference latitude cells are
+    narrower or wider than `cell_size_km`, so draw them from their polygons
+    rather than as fixed size squares. Longitudes are binned in [0, 360) so cells
+    do not split at the dateline.
+
+    Parameters
+    ----------
+    latitude : np.ndarray
+        Event latitudes.
+    longitude : np.ndarray
+        Event longitudes.
+    cell_size_km : float
+        Approximate width of each cell in km.
+    reviewed : np.ndarray, optional
+        Boolean reviewed flag of each event, used for the reviewed fraction.
+    magnitude : np.ndarray, optional
+        Magnitude of each event, used for the maximum magnitude. NaN values are ignored.
+    reference_latitude : float, optional
+        Latitude at which cells are square, by default the middle of New Zealand.
+
+    Returns
+    -------
+    bins : pd.DataFrame
+        One row per non-empty cell with the bin_id, the lon/lat of the cell's
+        south west corner and centre, its polygon (a closed ring of
+        [lon, lat] corners), count, reviewed_fraction and max_mw.
+    bin_ids : np.ndarray
+        The bin_id of each event.
+    """
+    latitude = np.asarray(latitude, dtype=float)
+    longitude = np.asarray(longitude, dtype=float) % 360.0
+    cell_lat = cell_size_km / 111.32
+    cell_lon = float(cell_lat / np.cos(np.radians(reference_latitude)))
+
+    cells = np.stack(
+        [np.floor(longitude / cell_lon), np.floor(latitude / cell_lat)], axis=1
+    ).astype(np.int64)
+    unique_cells, bin_ids = np.unique(cells, axis=0, return_inverse=True)
+    bin_ids = bin_ids.reshape(-1)
+    n_bins = len(unique_cells)
+
+    counts = np.bincount(bin_ids, minlength=n_bins)
+    if reviewed is not None:
+        reviewed_fraction = (
+            np.bincount(bin_ids, weights=np.asarray(reviewed, dtype=float), minlength=n_bins)
+            / counts
+        )
+    else:
+        reviewed_fraction = np.full(n_bins, np.nan)
+    max_mw = np.full(n_bins, np.nan)
+    if magnitude is not None:
+        np.fmax.at(max_mw, bin_ids, np.asarray(magnitude, dtype=float))
+
+    # Back to [-180, 180) for display
+    lon = (unique_cells[:, 0] * cell_lon + 180.0) % 360.0 - 180.0
+    lat = unique_cells[:, 1] * cell_lat
+    bins = pd.DataFrame(
+        {
+            "bin_id": np.arange(n_bins),
+            "lon": lon,
+            "lat": lat,
+            "centre_lon": lon + cell_lon / 2,
+            "centre_lat": lat + cell_lat / 2,
+            # Corners are not wrapped, so cells on the dateline stay contiguous
+            "polygon": [
+                [
+                    [west, south],
+                    [west + cell_lon, south],
+                    [west + cell_lon, south + cell_lat],
+                    [west, south + cell_lat],
+                    [west, south],
+                ]
+                for west, south in zip(lon.tolist(), lat.tolist())
+            ],
+            "count": counts,
+            "reviewed_fraction": reviewed_fraction,
+            "max_mw": max_mw,
+        }
+    )
+    return bins, bin_ids
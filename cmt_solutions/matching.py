@@ -0,0 +1,60 @@
+"""
+Matches events between catalogs, used to find the GeoNet PublicID of the
+events in the John Townend dataset.
+"""
+
+import pandas as pd
+
+
+def match_geonet_events(
+    john_townend_df: pd.DataFrame,
+    geonet_df: pd.DataFrame,
+    time_difference: float = 20,
+    depth_difference: float = 0.1,
+    lat_lon_difference: float = 1.0,
+) -> pd.Series:
+    """
+    Find the GeoNet PublicID of each John Townend event.
+
+    For each event the GeoNet events are checked in order of increasing time
+    difference, and the first within the location and depth tolerances is the match.
+
+    Parameters
+    ----------
+    john_townend_df : pd.DataFrame
+        John Townend events with date_dt, lat.geo, lon.geo and z.geo columns.
+    geonet_df : pd.DataFrame
+        GeoNet events with origintime, latitude, longitude, depth and publicid
+        columns, with a default RangeIndex.
+    time_difference : float, optional
+        Maximum time difference in seconds to consider a match.
+    depth_difference : float, optional
+        Maximum depth difference in km to consider a match.
+    lat_lon_difference : float, optional
+        Maximum latitude/longitude difference in degrees to consider a match.
+
+    Returns
+    -------
+    pd.Series
+        The matching GeoNet PublicID for each John Townend event (same index
+        as `john_townend_df`), None where there is no match.
+    """
+    public_ids = pd.Series(None, index=john_townend_df.index, dtype=object)
+    for jt_idx, john_townend_row in john_townend_df.iterrows():
+        # Find matching GeoNet entry by datetime
+        date = john_townend_row["date_dt"]
+        # Calculate time differences in seconds
+        time_diffs = abs((geonet_df["origintime"] - date).dt.total_seconds())
+        # Sort geonet rows by time difference
+        sorted_indices = time_diffs.argsort()
+        for idx in sorted_indices:
+            if time_diffs[idx] > time_difference:
+                break
+            geo_row = geonet_df.loc[idx]
+            lat_diff = abs(geo_row["latitude"] - john_townend_row["lat.geo"])
+            lon_diff = abs(geo_row["longitude"] - john_townend_row["lon.geo"])
+            depth_diff = abs(geo_row["depth"] - john_townend_row["z.geo"])
+            if lat_diff <= lat_lon_difference and lon_diff <= lat_lon_difference and depth_diff <= depth_difference:
+                public_ids[jt_idx] = geo_row["publicid"]
+                break
+    return public_ids
@@ -5,7 +5,6 @@ Useful as the John Townend dataset originally had only a single nodal plane prov
 
 import numpy as np
 import pandas as pd
-from obspy.imaging import beachball
 
 
 def conjugate_nodal_plane(strike: float, dip: float, rake: float):
@@ -31,6 +30,9 @@ def conjugate_nodal_plane(strike: float, dip: float, rake: float):
         Rake angle of the conjugate nodal plane in degrees.
     """
 
+    # Imported here as obspy.imaging pulls in matplotlib, which is slow to import
+    from obspy.imaging import beachball
+
     s2, d2, r2 = beachball.aux_plane(strike, dip, rake)
 
     # Normalise strike to [0, 360]
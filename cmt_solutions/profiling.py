@@ -0,0 +1,264 @@
+"""
+Lightweight per-stage timing and profiling for the scripts.
+
+A run is wrapped in `profile_run`, and the steps of interest in `stage`. Each
+stage records its wall time, peak memory and optionally the number of rows
+processed and bytes transferred. When the run finishes the stages are written
+as JSON. Outside of an enabled run `stage` does nothing, so library code such
+as `cmt_data` can be instrumented at no cost to normal use.
+
+By default the peak memory is the peak resident set size of the process, which
+costs nothing to measure but only ever grows. Tracing every allocation with
+tracemalloc gives the peak of each stage, but slows Python code down by a
+factor of two or more, so it is only enabled with ``trace_memory=True``.
+
+Example
+-------
+>>> with profile_run("update_cmt", enabled=True):
+...     with stage("download") as download:
+...         df = pd.read_csv(url)
+...         download.rows = len(df)
+"""
+
+import cProfile
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, where the peak memory is not recorded
+    resource = None
+
+
+@dataclass
+class Stage:
+    """
+    Measurements for a single stage of a run.
+
+    Parameters
+    ----------
+    name : str
+        The name of the stage.
+    start : float
+        Time since the start of the run the stage started, in seconds.
+    seconds : float
+        Wall time of the stage in seconds.
+    peak_memory_bytes : int
+        Peak memory in bytes. When tracing memory this is the peak traced
+        during the stage, otherwise the peak resident set size of the process
+        by the end of the stage.
+    rows : int, optional
+        Number of rows processed by the stage.
+    bytes : int, optional
+        Number of bytes read, downloaded or written by the stage.
+    depth : int
+        Nesting depth of the stage, 0 for top level stages.
+    """
+
+    name: str
+    start: float = 0.0
+    seconds: float = 0.0
+    peak_memory_bytes: int = 0
+    rows: Optional[int] = None
+    bytes: Optional[int] = None
+    depth: int = 0
+
+
+@dataclass
+class Profiler:
+    """
+    Collects the stages of a single run.
+
+    Parameters
+    ----------
+    name : str
+        The name of the run.
+    stages : list[Stage]
+        The completed stages, in the order they started.
+    trace_memory : bool
+        Whether allocations are traced with tracemalloc.
+    """
+
+    name: str
+    stages: list[Stage] = field(default_factory=list)
+    trace_memory: bool = False
+    _start: float = field(default_factory=time.perf_counter, repr=False)
+    _stack: list[Stage] = field(default_factory=list, repr=False)
+
+    def elapsed(self) -> float:
+        """
+        Return the time since the start of the run.
+
+        Returns
+        -------
+        float
+            Elapsed wall time in seconds.
+        """
+        return time.perf_counter() - self._start
+
+    def peak_memory(self) -> int:
+        """
+        Return the current peak memory of the run.
+
+        Returns
+        -------
+        int
+            The peak traced memory since the last reset if tracing memory,
+            otherwise the peak resident set size of the process, in bytes.
+        """
+        if self.trace_memory:
+            return tracemalloc.get_traced_memory()[1]
+        if resource is None:
+            return 0
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+    def to_dict(self) -> dict:
+        """
+        Return the run and its stages as a JSON serialisable dictionary.
+
+        Returns
+        -------
+        dict
+            The run summary with the list of stages.
+        """
+        # The traced peak is reset for each stage, so take the largest stage peak
+        peak_memory_bytes = max(
+            [recorded.peak_memory_bytes for recorded in self.stages]
+            + [self.peak_memory()]
+        )
+        return {
+            "run": self.name,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "seconds": self.elapsed(),
+            "memory": "traced" if self.trace_memory else "max_rss",
+            "peak_memory_bytes": peak_memory_bytes,
+            "stages": [asdict(recorded) for recorded in self.stages],
+        }
+
+
+# The profiler of the currently active run, None when profiling is disabled
+_active_profiler: Optional[Profiler] = None
+
+
+@contextmanager
+def stage(name: str):
+    """
+    Time a stage of the active run.
+
+    Set the `rows` and `bytes` attributes of the yielded stage to record the
+    amount of data processed. Does nothing if no run is being profiled.
+
+    Parameters
+    ----------
+    name : str
+        The name of the stage.
+
+    Yields
+    ------
+    Stage
+        The stage being measured.
+    """
+    profiler = _active_profiler
+    current = Stage(name)
+    if profiler is None:
+        yield current
+        return
+
+    parent = profiler._stack[-1] if profiler._stack else None
+    if profiler.trace_memory:
+        if parent is not None:
+            # Keep the peak of the parent so far, as the peak is reset for each stage
+            parent.peak_memory_bytes = max(
+                parent.peak_memory_bytes, profiler.peak_memory()
+            )
+        tracemalloc.reset_peak()
+    current.depth = len(profiler._stack)
+    current.start = profiler.elapsed()
+    profiler.stages.append(current)
+    profiler._stack.append(current)
+    try:
+        yield current
+    finally:
+        current.seconds = profiler.elapsed() - current.start
+        current.peak_memory_bytes = max(
+            current.peak_memory_bytes, profiler.peak_memory()
+        )
+        profiler._stack.pop()
+        if parent is not None:
+            parent.peak_memory_bytes = max(
+                parent.peak_memory_bytes, current.peak_memory_bytes
+            )
+
+
+@contextmanager
+def profile_run(
+    name: str,
+    enabled: bool = True,
+    output: Path = None,
+    dump: Path = None,
+    trace_memory: bool = False,
+):
+    """
+    Profile a run, writing the stage measurements as JSON when it finishes.
+
+    Parameters
+    ----------
+    name : str
+        The name of the run.
+    enabled : bool, optional
+        If False nothing is measured, so scripts can pass their --profile option directly.
+    output : Path, optional
+        File to write the JSON to, by default it is written to stderr.
+    dump : Path, optional
+        File to write a cProfile dump of the run to, which can be read with
+        pstats or snakeviz. Profiling every call also slows the run down.
+    trace_memory : bool, optional
+        Trace allocations with tracemalloc to record the peak memory of each
+        stage. This slows the run down considerably, so the stage times are
+        not representative when it is enabled.
+
+    Yields
+    ------
+    Profiler or None
+        The profiler for the run, None if profiling is disabled.
+    """
+    global _active_profiler
+
+    if not enabled:
+        yield None
+        return
+
+    call_profiler = None
+    if dump is not None:
+        call_profiler = cProfile.Profile()
+        call_profiler.enable()
+
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    profiler = Profiler(name, trace_memory=trace_memory)
+    previous_profiler, _active_profiler = _active_profiler, profiler
+    try:
+        yield profiler
+    finally:
+        if call_profiler is not None:
+            call_profiler.disable()
+            call_profiler.dump_stats(dump)
+        _active_profiler = previous_profiler
+        summary = json.dumps(profiler.to_dict(), indent=2)
+        if started_tracing:
+            tracemalloc.stop()
+        if output is None:
+            print(summary, file=sys.stderr)
+        else:
+            Path(output).write_text(summary + "\n")
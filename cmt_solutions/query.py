@@ -0,0 +1,323 @@
+"""
+In-memory indexes for answering repeated queries over a CMT catalog.
+
+A `CatalogIndex` holds a `CMTCatalog` together with sorted PublicID, time,
+magnitude and spatial grid indexes, so each query only touches the events
+that can match rather than scanning or re-parsing the whole catalog. It is
+used by the catalog service (`scripts/serve_cmt_catalog.py`) and by
+`CatalogClient` when the service is not running.
+"""
+
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from cmt_solutions import cmt_data
+from cmt_solutions.catalog import CMTCatalog
+
+
+def _as_float64(values: np.ndarray) -> np.ndarray:
+    """
+    Convert a numeric column to float64 without float32 rounding artefacts.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The column values.
+
+    Returns
+    -------
+    np.ndarray
+        The values as float64. float32 values are widened through their
+        shortest representation, so a stored 5.1 becomes 5.1 rather than
+        5.099999904632568 and compares equal to a 5.1 filter bound.
+    """
+    if values.dtype == np.float32:
+        return values.astype(str).astype(np.float64)
+    return values.astype(np.float64)
+
+
+class CatalogIndex:
+    """
+    A CMT catalog with indexes for looking up events by ID, time, magnitude and location.
+
+    Parameters
+    ----------
+    catalog : CMTCatalog
+        The catalog to index.
+    cell_size : float, optional
+        Size in degrees of the cells of the spatial grid index.
+    """
+
+    def __init__(self, catalog: CMTCatalog, cell_size: float = 1.0):
+        """Build the indexes of the catalog."""
+        self.catalog = catalog
+        self.cell_size = cell_size
+        self.n_lon_cells = int(np.ceil(360.0 / cell_size))
+
+        # Build the PublicID index up front rather than on the first lookup
+        catalog._public_id_index()
+
+        # Dates are compared as YYYYMMDDhhmmss numbers, as in iter_cmt_data
+        self.dates = catalog.column("Date").astype(np.float64)
+        self._time_order = np.argsort(self.dates, kind="stable")
+        self._sorted_dates = self.dates[self._time_order]
+
+        # Compared with the same float64 values as iter_cmt_data, so events
+        # exactly on a filter bound are kept
+        self.magnitudes = _as_float64(catalog.column("Mw"))
+        self._magnitude_order = np.argsort(self.magnitudes, kind="stable")
+        self._sorted_magnitudes = self.magnitudes[self._magnitude_order]
+
+        self.latitudes = _as_float64(catalog.column("Latitude"))
+        self.longitudes = _as_float64(catalog.column("Longitude"))
+        cells = self._cell_keys(self.latitudes, self.longitudes)
+        self._cell_order = np.argsort(cells, kind="stable")
+        self._sorted_cells = cells[self._cell_order]
+
+    @classmethod
+    def from_csv(cls, path: Path = cmt_data.CMT_DATA_PATH, **kwargs) -> "CatalogIndex":
+        """
+        Load and index a catalog from a CSV file.
+
+        Parameters
+        ----------
+        path : Path, optional
+            Path to the catalog CSV file, by default the CMT solutions dataset.
+        **kwargs
+            Additional keyword arguments passed to the `CatalogIndex` constructor.
+
+        Returns
+        -------
+        CatalogIndex
+            The indexed catalog.
+        """
+        return cls(CMTCatalog.from_csv(path), **kwargs)
+
+    def __len__(self):
+        """Return the number of events in the catalog."""
+        return len(self.catalog)
+
+    def _cell_keys(self, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        """
+        Compute the spatial grid cell of each location.
+
+        Parameters
+        ----------
+        latitudes : np.ndarray
+            Latitudes of the locations.
+        longitudes : np.ndarray
+            Longitudes of the locations.
+
+        Returns
+        -------
+        np.ndarray
+            int64 cell key of each location, -1 where the location is missing.
+        """
+        lat_cells = np.floor((latitudes + 90.0) / self.cell_size)
+        # Longitudes are gridded in [0, 360) so the dateline does not split cells
+        lon_cells = np.floor((longitudes % 360.0) / self.cell_size)
+        keys = lat_cells * self.n_lon_cells + lon_cells
+        return np.where(np.isfinite(keys), keys, -1).astype(np.int64)
+
+    @staticmethod
+    def _sorted_range(
+        order: np.ndarray, sorted_values: np.ndarray, low: float, high: float
+    ) -> np.ndarray:
+        """
+        Return the rows whose value lies within a range using a sorted index.
+
+        Parameters
+        ----------
+        order : np.ndarray
+            Row indices sorting the values.
+        sorted_values : np.ndarray
+            The sorted values.
+        low : float
+            Lower bound (inclusive), None for no bound.
+        high : float
+            Upper bound (inclusive), None for no bound.
+
+        Returns
+        -------
+        np.ndarray
+            The rows within the range, in sorted value order.
+        """
+        start = 0 if low is None else np.searchsorted(sorted_values, low, side="left")
+        # NaN values sort last, so stop before them when there is no upper bound
+        end = (
+            np.searchsorted(sorted_values, np.inf, side="right")
+            if high is None
+            else np.searchsorted(sorted_values, high, side="right")
+        )
+        return order[start:end]
+
+    def _bbox_rows(self, bbox: tuple[float, float, float, float]) -> np.ndarray:
+        """
+        Return the rows in the grid cells overlapping a bounding box.
+
+        Parameters
+        ----------
+        bbox : tuple[float, float, float, float]
+            Bounding box as (min_lon, min_lat, max_lon, max_lat).
+
+        Returns
+        -------
+        np.ndarray
+            Candidate rows, a superset of the events within the box.
+        """
+        min_lon, min_lat, max_lon, max_lat = bbox
+        lat_cells = np.arange(
+            np.floor((max(min_lat, -90.0) + 90.0) / self.cell_size),
+            np.floor((min(max_lat, 90.0) + 90.0) / self.cell_size) + 1,
+        )
+        if min_lon <= max_lon and max_lon - min_lon >= 360.0:
+            lon_cells = np.arange(self.n_lon_cells)
+        else:
+            first = np.floor((min_lon % 360.0) / self.cell_size)
+            last = np.floor((max_lon % 360.0) / self.cell_size)
+            if first <= last:
+                lon_cells = np.arange(first, last + 1)
+            else:
+                # The box wraps around 0 degrees longitude in the [0, 360) grid
+                lon_cells = np.concatenate(
+                    [np.arange(first, self.n_lon_cells), np.arange(0, last + 1)]
+                )
+        keys = (lat_cells[:, None] * self.n_lon_cells + lon_cells[None, :]).ravel()
+        starts = np.searchsorted(self._sorted_cells, keys, side="left")
+        ends = np.searchsorted(self._sorted_cells, keys, side="right")
+        return np.concatenate(
+            [self._cell_order[start:end] for start, end in zip(starts, ends)]
+            + [np.empty(0, dtype=np.int64)]
+        )
+
+    def query(
+        self,
+        min_mw: float = None,
+        max_mw: float = None,
+        start_date: datetime = None,
+        end_date: datetime = None,
+        bbox: tuple[float, float, float, float] = None,
+    ) -> np.ndarray:
+        """
+        Find the events matching magnitude, time and bounding box filters.
+
+        The filters have the same meaning as in `cmt_data.iter_cmt_data`. The
+        most selective index gives the candidate events, and the remaining
+        filters are only checked for those candidates.
+
+        Parameters
+        ----------
+        min_mw : float, optional
+            Minimum magnitude (inclusive).
+        max_mw : float, optional
+            Maximum magnitude (inclusive).
+        start_date : datetime, optional
+            Earliest event time (inclusive).
+        end_date : datetime, optional
+            Latest event time (inclusive).
+        bbox : tuple[float, float, float, float], optional
+            Bounding box as (min_lon, min_lat, max_lon, max_lat). If min_lon is
+            greater than max_lon the box is taken to cross the dateline.
+
+        Returns
+        -------
+        np.ndarray
+            The rows of the matching events, in catalog order.
+        """
+        start_key = start_date and float(start_date.strftime(cmt_data.CMT_DATE_FORMAT))
+        end_key = end_date and float(end_date.strftime(cmt_data.CMT_DATE_FORMAT))
+
+        candidates = []
+        if min_mw is not None or max_mw is not None:
+            candidates.append(
+                self._sorted_range(
+                    self._magnitude_order, self._sorted_magnitudes, min_mw, max_mw
+                )
+            )
+        if start_key is not None or end_key is not None:
+            candidates.append(
+                self._sorted_range(self._time_order, self._sorted_dates, start_key, end_key)
+            )
+        if bbox is not None:
+            candidates.append(self._bbox_rows(bbox))
+        if not candidates:
+            return np.arange(len(self.catalog))
+
+        rows = np.sort(min(candidates, key=len))
+        mask = np.ones(len(rows), dtype=bool)
+        magnitudes = self.magnitudes[rows]
+        if min_mw is not None:
+            mask &= magnitudes >= min_mw
+        if max_mw is not None:
+            mask &= magnitudes <= max_mw
+        dates = self.dates[rows]
+        if start_key is not None:
+            mask &= dates >= start_key
+        if end_key is not None:
+            mask &= dates <= end_key
+        if bbox is not None:
+            min_lon, min_lat, max_lon, max_lat = bbox
+            lat = self.latitudes[rows]
+            lon = self.longitudes[rows]
+            mask &= (lat >= min_lat) & (lat <= max_lat)
+            if min_lon <= max_lon:
+                mask &= (lon >= min_lon) & (lon <= max_lon)
+            else:
+                # Box crosses the dateline
+                mask &= (lon >= min_lon) | (lon <= max_lon)
+        return rows[mask]
+
+    def event_row(self, event_id: str) -> int:
+        """
+        Look up the row of an event by its PublicID.
+
+        Parameters
+        ----------
+        event_id : str
+            The PublicID of the event.
+
+        Returns
+        -------
+        int
+            The row of the event in the catalog.
+        """
+        try:
+            return self.catalog._public_id_index()[event_id]
+        except KeyError:
+            raise ValueError(f"Event ID {event_id} not found in CMT catalog.") from None
+
+    def records(self, rows: np.ndarray, columns: list[str] = None) -> list[dict]:
+        """
+        Convert events to JSON serialisable records.
+
+        Parameters
+        ----------
+        rows : np.ndarray
+            The rows of the events.
+        columns : list[str], optional
+            Columns to include, by default every column.
+
+        Returns
+        -------
+        list[dict]
+            One dictionary of column name to value per event, with missing
+            values as None.
+        """
+        columns = self.catalog.columns if columns is None else list(columns)
+        unknown = [column for column in columns if column not in self.catalog.columns]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+        events = self.catalog[np.asarray(rows, dtype=np.int64)]
+        values = []
+        for column in columns:
+            array = events.column(column)
+            if array.dtype == np.float32:
+                array = _as_float64(array)
+            missing = pd.isna(array)
+            values.append(
+                [None if is_missing else value for value, is_missing in zip(array.tolist(), missing)]
+            )
+        return [dict(zip(columns, event)) for event in zip(*values)]
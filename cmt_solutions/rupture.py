@@ -0,0 +1,202 @@
+"""
+Approximate rupture geometry of the nodal planes of CMT solutions.
+
+The planes are sized with the Leonard (2014) magnitude scaling relation and
+centred on the event epicentre at the surface, as shown in the reviewer.
+"""
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+from shapely.geometry import Point, Polygon
+
+if TYPE_CHECKING:
+    from source_modelling.sources import Plane
+
+
+def nodal_plane_dimensions(magnitude: float, rake: float) -> tuple[float, float]:
+    """
+    Compute the length and width of a rupture plane from its magnitude.
+
+    Parameters
+    ----------
+    magnitude : float
+        Moment magnitude (Mw) of the event.
+    rake : float
+        Rake of the nodal plane in degrees.
+
+    Returns
+    -------
+    length : float
+        Length of the plane along strike in km.
+    width : float
+        Width of the plane down dip in km.
+    """
+    # Imported here as source_modelling is slow to import
+    from source_modelling import magnitude_scaling
+
+    return magnitude_scaling.magnitude_to_length_width(
+        magnitude_scaling.ScalingRelation.LEONARD2014, magnitude, rake
+    )
+
+
+def nodal_plane(
+    latitude: float,
+    longitude: float,
+    magnitude: float,
+    strike: float,
+    dip: float,
+    rake: float,
+    dimensions: tuple[float, float] = None,
+) -> "Plane":
+    """
+    Build the rupture plane for a nodal plane of an event.
+
+    Parameters
+    ----------
+    latitude : float
+        Latitude of the event epicentre.
+    longitude : float
+        Longitude of the event epicentre.
+    magnitude : float
+        Moment magnitude (Mw) of the event.
+    strike : float
+        Strike of the nodal plane in degrees.
+    dip : float
+        Dip of the nodal plane in degrees.
+    rake : float
+        Rake of the nodal plane in degrees.
+    dimensions : tuple[float, float], optional
+        The (length, width) of the plane in km if already computed with
+        `nodal_plane_dimensions`, by default they are computed here.
+
+    Returns
+    -------
+    Plane
+        The rupture plane, centred on the epicentre at the surface.
+    """
+    from source_modelling.sources import Plane
+
+    length, width = dimensions or nodal_plane_dimensions(magnitude, rake)
+    return Plane.from_centroid_strike_dip(
+        np.asarray([latitude, longitude, 0]),
+        dip,
+        length,
+        width,
+        strike=strike,
+    )
+
+
+def nodal_plane_polygon(plane: "Plane", longitude: float) -> Polygon:
+    """
+    Convert the corners of a rupture plane to a (lon, lat) polygon.
+
+    Longitudes are unwrapped around the epicentre so that planes crossing the
+    dateline stay contiguous.
+
+    Parameters
+    ----------
+    plane : Plane
+        The rupture plane.
+    longitude : float
+        Longitude of the event epicentre.
+
+    Returns
+    -------
+    Polygon
+        Polygon of the plane's surface projection.
+    """
+    corners = np.asarray(plane.corners)[:, :2]
+    lons = longitude + (corners[:, 1] - longitude + 180.0) % 360.0 - 180.0
+    return Polygon(np.column_stack([lons, corners[:, 0]]))
+
+
+def _or_none(value: object) -> object:
+    """
+    Replace missing values (None or NaN) with None.
+
+    Parameters
+    ----------
+    value : object
+        The value to check.
+
+    Returns
+    -------
+    object
+        None if the value is missing, the value (as a Python scalar) otherwise.
+    """
+    if value is None or pd.isna(value):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def event_features(events: pd.DataFrame) -> list[dict]:
+    """
+    Build the epicentre and nodal plane features for a set of events.
+
+    Parameters
+    ----------
+    events : pd.DataFrame
+        CMT events with the columns of CMT_solutions.csv.
+
+    Returns
+    -------
+    list[dict]
+        One feature per epicentre and per nodal plane. Each feature is a
+        dictionary with a shapely ``geometry`` and its attributes. Planes
+        with missing magnitude or angles are skipped.
+    """
+    features = []
+    for event in events.itertuples(index=False):
+        attributes = {
+            "PublicID": str(event.PublicID),
+            "Date": str(event.Date),
+            "Mw": _or_none(event.Mw),
+            "CD": _or_none(event.CD),
+            "reviewed": str(getattr(event, "reviewed", False)).strip().lower() in {"true", "1"},
+            "source": _or_none(getattr(event, "source", None)),
+        }
+        features.append(
+            {
+                "geometry": Point(event.Longitude, event.Latitude),
+                "feature_type": "epicentre",
+                "plane": None,
+                "strike": None,
+                "dip": None,
+                "rake": None,
+                "length_km": None,
+                "width_km": None,
+                **attributes,
+            }
+        )
+        for plane_number in (1, 2):
+            strike = getattr(event, f"strike{plane_number}")
+            dip = getattr(event, f"dip{plane_number}")
+            rake = getattr(event, f"rake{plane_number}")
+            if np.isnan([event.Mw, strike, dip, rake]).any():
+                continue
+            length, width = nodal_plane_dimensions(event.Mw, rake)
+            plane = nodal_plane(
+                event.Latitude,
+                event.Longitude,
+                event.Mw,
+                strike,
+                dip,
+                rake,
+                dimensions=(length, width),
+            )
+            features.append(
+                {
+                    "geometry": nodal_plane_polygon(plane, event.Longitude),
+                    "feature_type": "nodal_plane",
+                    "plane": plane_number,
+                    "strike": float(strike),
+                    "dip": float(dip),
+                    "rake": float(rake),
+                    "length_km": float(length),
+                    "width_km": float(width),
+                    **attributes,
+                }
+            )
+    return features
@@ -0,0 +1,401 @@
+"""
+Content-addressed snapshots of the CMT catalog.
+
+A snapshot splits the catalog into one block of events per year. Each block is
+stored once under the SHA-256 hash of its contents, so a new snapshot only
+stores the blocks that changed and shares the rest with earlier snapshots. A
+snapshot itself is a small JSON manifest listing its blocks, identified by the
+hash of those blocks, so snapshotting an unchanged catalog gives the same ID.
+
+Values are stored exactly as they appear in the CSV file, and the events in
+each block are ordered by Date and PublicID, so reordering the rows of the
+catalog does not change its snapshot. Events are matched between snapshots by
+PublicID, so a catalog must not repeat a PublicID. Comparing two snapshots
+only reads the blocks whose hashes differ, so the cost of a diff grows with
+the number of changed blocks rather than with the size of the catalog.
+
+Record the snapshot ID with the outputs of a simulation run to be able to
+restore the exact catalog it used.
+
+Example
+-------
+>>> store = SnapshotStore()
+>>> snapshot_id = store.snapshot(message="After the 2024 GeoNet update")
+>>> changes = store.diff(previous_id, snapshot_id)
+>>> store.restore(snapshot_id, Path("CMT_solutions_run.csv"))
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from cmt_solutions import cmt_data
+
+SNAPSHOT_STORE_PATH = cmt_data.CMT_DATA_PATH.parent / "snapshots"
+# Block key of events without a Date
+UNKNOWN_BLOCK = "unknown"
+
+
+@dataclass
+class SnapshotDiff:
+    """
+    The changes between two snapshots of the catalog.
+
+    Parameters
+    ----------
+    old_id : str
+        The ID of the earlier snapshot.
+    new_id : str
+        The ID of the later snapshot.
+    added : list[str]
+        PublicIDs of the events only in the later snapshot.
+    removed : list[str]
+        PublicIDs of the events only in the earlier snapshot.
+    modified : dict[str, list[str]]
+        Mapping of the PublicID of each event in both snapshots with
+        different values to the columns that changed.
+    changed_blocks : list[str]
+        Keys of the blocks that differ between the snapshots, the only blocks read.
+    """
+
+    old_id: str
+    new_id: str
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    modified: dict[str, list[str]] = field(default_factory=dict)
+    changed_blocks: list[str] = field(default_factory=list)
+
+
+def _block_key(date: str) -> str:
+    """
+    Return the block an event belongs to from its Date.
+
+    Parameters
+    ----------
+    date : str
+        The Date of the event as written in the CSV, e.g. 20030800000000.
+
+    Returns
+    -------
+    str
+        The year of the event, or UNKNOWN_BLOCK if the Date is missing.
+    """
+    return date[:4] if date else UNKNOWN_BLOCK
+
+
+class SnapshotStore:
+    """
+    A directory of catalog snapshots sharing their blocks.
+
+    The store holds the blocks in ``blocks/`` as gzipped CSV files named by
+    their hash, and the snapshot manifests in ``manifests/``.
+
+    Parameters
+    ----------
+    path : Path, optional
+        The store directory, by default data/snapshots. It is created if it does not exist.
+    """
+
+    def __init__(self, path: Path = SNAPSHOT_STORE_PATH):
+        """Open the store, creating its directories if needed."""
+        self.path = Path(path)
+        self.blocks_path = self.path / "blocks"
+        self.manifests_path = self.path / "manifests"
+        self.blocks_path.mkdir(parents=True, exist_ok=True)
+        self.manifests_path.mkdir(parents=True, exist_ok=True)
+
+    def _block_path(self, block_hash: str) -> Path:
+        """
+        Return the file storing a block.
+
+        Parameters
+        ----------
+        block_hash : str
+            The hash of the block.
+
+        Returns
+        -------
+        Path
+            The gzipped CSV file of the block, in a subdirectory named by the first two characters of the hash.
+        """
+        return self.blocks_path / block_hash[:2] / f"{block_hash}.csv.gz"
+
+    @staticmethod
+    def _write_atomic(path: Path, content: bytes):
+        """
+        Write a file so that readers never see it partially written.
+
+        Parameters
+        ----------
+        path : Path
+            The file to write.
+        content : bytes
+            The content of the file.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as temporary_file:
+            temporary_file.write(content)
+        os.replace(temporary_file.name, path)
+
+    def snapshot(self, catalog_path: Path = cmt_data.CMT_DATA_PATH, message: str = "") -> str:
+        """
+        Record a snapshot of a catalog CSV file.
+
+        Only blocks not already in the store are written. If an identical
+        snapshot already exists its ID is returned and it is left unchanged.
+
+        Parameters
+        ----------
+        catalog_path : Path, optional
+            The catalog CSV file, by default the CMT solutions dataset.
+        message : str, optional
+            A description of this version of the catalog.
+
+        Returns
+        -------
+        str
+            The ID of the snapshot.
+
+        Raises
+        ------
+        ValueError
+            If the catalog has more than one event with the same PublicID, as
+            snapshots are compared event by event using the PublicID.
+        """
+        # Read every value as its original text so the snapshot is exact
+        catalog_df = pd.read_csv(catalog_path, dtype=str, keep_default_na=False)
+        duplicated = catalog_df["PublicID"][catalog_df["PublicID"].duplicated()].unique()
+        if len(duplicated):
+            raise ValueError(
+                f"{catalog_path} has {len(duplicated)} duplicated PublicIDs "
+                f"({', '.join(sorted(duplicated)[:10])}), remove them before taking a snapshot."
+            )
+        catalog_df = catalog_df.sort_values(["Date", "PublicID"], kind="stable")
+
+        blocks = {}
+        for key, block_df in catalog_df.groupby(
+            catalog_df["Date"].map(_block_key), sort=True
+        ):
+            content = block_df.to_csv(index=False, lineterminator="\n").encode()
+            block_hash = hashlib.sha256(content).hexdigest()
+            block_path = self._block_path(block_hash)
+            if not block_path.exists():
+                self._write_atomic(block_path, gzip.compress(content, mtime=0))
+            blocks[key] = {"hash": block_hash, "rows": len(block_df)}
+
+        columns = list(catalog_df.columns)
+        snapshot_id = hashlib.sha256(
+            json.dumps({"columns": columns, "blocks": blocks}, sort_keys=True).encode()
+        ).hexdigest()
+        manifest_path = self.manifests_path / f"{snapshot_id}.json"
+        if not manifest_path.exists():
+            manifest = {
+                "id": snapshot_id,
+                "created": datetime.now(timezone.utc).isoformat(),
+                "message": message,
+                "source": str(catalog_path),
+                "rows": len(catalog_df),
+                "columns": columns,
+                "blocks": blocks,
+            }
+            self._write_atomic(manifest_path, json.dumps(manifest, indent=2).encode())
+        return snapshot_id
+
+    def manifest(self, snapshot_id: str) -> dict:
+        """
+        Read the manifest of a snapshot.
+
+        Parameters
+        ----------
+        snapshot_id : str
+            The snapshot ID, or a unique prefix of it.
+
+        Returns
+        -------
+        dict
+            The manifest, with the ID, creation time, message, source file,
+            number of rows, columns and the hash and number of rows of each block.
+        """
+        matches = list(self.manifests_path.glob(f"{snapshot_id}*.json"))
+        if not matches:
+            raise ValueError(f"Snapshot {snapshot_id} not found in {self.path}.")
+        if len(matches) > 1:
+            raise ValueError(f"Snapshot ID {snapshot_id} is ambiguous.")
+        return json.loads(matches[0].read_text())
+
+    def snapshots(self) -> list[dict]:
+        """
+        List the snapshots in the store.
+
+        Returns
+        -------
+        list[dict]
+            The manifest of every snapshot, oldest first.
+        """
+        manifests = [
+            json.loads(manifest_path.read_text())
+            for manifest_path in self.manifests_path.glob("*.json")
+        ]
+        return sorted(manifests, key=lambda manifest: manifest["created"])
+
+    def _read_block(self, block_hash: str) -> bytes:
+        """
+        Read the CSV content of a block.
+
+        Parameters
+        ----------
+        block_hash : str
+            The hash of the block.
+
+        Returns
+        -------
+        bytes
+            The CSV content of the block, including the header.
+        """
+        return gzip.decompress(self._block_path(block_hash).read_bytes())
+
+    def _read_blocks(self, manifest: dict, keys: list[str]) -> pd.DataFrame:
+        """
+        Read the events of some blocks of a snapshot as text.
+
+        Parameters
+        ----------
+        manifest : dict
+            The manifest of the snapshot.
+        keys : list[str]
+            The keys of the blocks to read, keys not in the snapshot are skipped.
+
+        Returns
+        -------
+        pd.DataFrame
+            The events of the blocks indexed by PublicID, with every value as its original text.
+        """
+        block_dfs = [
+            pd.read_csv(
+                io.BytesIO(self._read_block(manifest["blocks"][key]["hash"])),
+                dtype=str,
+                keep_default_na=False,
+            )
+            for key in keys
+            if key in manifest["blocks"]
+        ]
+        if not block_dfs:
+            return pd.DataFrame(columns=manifest["columns"]).set_index("PublicID")
+        return pd.concat(block_dfs).set_index("PublicID")
+
+    def catalog_bytes(self, snapshot_id: str) -> bytes:
+        """
+        Rebuild the catalog CSV of a snapshot.
+
+        Parameters
+        ----------
+        snapshot_id : str
+            The snapshot ID, or a unique prefix of it.
+
+        Returns
+        -------
+        bytes
+            The catalog as CSV, with the events ordered by Date and PublicID.
+        """
+        manifest = self.manifest(snapshot_id)
+        header = ",".join(manifest["columns"]).encode()
+        parts = []
+        for key in sorted(manifest["blocks"]):
+            # Every block starts with the same header line, which is written once
+            header, rows = self._read_block(manifest["blocks"][key]["hash"]).split(b"\n", 1)
+            parts.append(rows)
+        return header + b"\n" + b"".join(parts)
+
+    def load(self, snapshot_id: str) -> pd.DataFrame:
+        """
+        Load the catalog of a snapshot.
+
+        Parameters
+        ----------
+        snapshot_id : str
+            The snapshot ID, or a unique prefix of it.
+
+        Returns
+        -------
+        pd.DataFrame
+            The catalog, parsed in the same way as `cmt_data.get_cmt_data`.
+        """
+        return pd.read_csv(io.BytesIO(self.catalog_bytes(snapshot_id)), dtype={"PublicID": str})
+
+    def restore(self, snapshot_id: str, output: Path):
+        """
+        Write the catalog of a snapshot to a CSV file.
+
+        Parameters
+        ----------
+        snapshot_id : str
+            The snapshot ID, or a unique prefix of it.
+        output : Path
+            The CSV file to write, e.g. data/CMT_solutions.csv to roll the catalog back.
+        """
+        self._write_atomic(Path(output), self.catalog_bytes(snapshot_id))
+
+    def diff(self, old_id: str, new_id: str) -> SnapshotDiff:
+        """
+        Compare two snapshots event by event.
+
+        Only the blocks whose hashes differ are read. An event that moved to
+        a different year is in two changed blocks, and is reported as
+        modified rather than as removed and added. Numeric values that only
+        differ in formatting (e.g. 5.10 and 5.1) are not reported as changes.
+
+        Parameters
+        ----------
+        old_id : str
+            The ID of the earlier snapshot, or a unique prefix of it.
+        new_id : str
+            The ID of the later snapshot, or a unique prefix of it.
+
+        Returns
+        -------
+        SnapshotDiff
+            The added, removed and modified events.
+        """
+        old_manifest = self.manifest(old_id)
+        new_manifest = self.manifest(new_id)
+        old_blocks = old_manifest["blocks"]
+        new_blocks = new_manifest["blocks"]
+        changed_blocks = sorted(
+            key
+            for key in set(old_blocks) | set(new_blocks)
+            if old_blocks.get(key, {}).get("hash") != new_blocks.get(key, {}).get("hash")
+        )
+        changes = SnapshotDiff(
+            old_manifest["id"], new_manifest["id"], changed_blocks=changed_blocks
+        )
+        if not changed_blocks and old_manifest["columns"] == new_manifest["columns"]:
+            return changes
+
+        old_df = self._read_blocks(old_manifest, changed_blocks)
+        new_df = self._read_blocks(new_manifest, changed_blocks)
+        changes.added = sorted(new_df.index.difference(old_df.index))
+        changes.removed = sorted(old_df.index.difference(new_df.index))
+
+        common = old_df.index.intersection(new_df.index)
+        columns = [column for column in old_df.columns if column in new_df.columns] + [
+            column for column in new_df.columns if column not in old_df.columns
+        ]
+        old_values = old_df.loc[common].reindex(columns=columns)
+        new_values = new_df.loc[common].reindex(columns=columns)
+        # Columns missing from one snapshot are NaN on that side
+        differs = (old_values != new_values) & ~(old_values.isna() & new_values.isna())
+        for column in differs.columns[differs.any()]:
+            old_numbers = pd.to_numeric(old_values[column], errors="coerce")
+            new_numbers = pd.to_numeric(new_values[column], errors="coerce")
+            differs[column] &= old_numbers != new_numbers
+        for public_id, row in differs[differs.any(axis=1)].iterrows():
+            changes.modified[public_id] = list(row.index[row.to_numpy()])
+        return changes
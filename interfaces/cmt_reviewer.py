@@ -1,154 +1,41 @@
-import numpy as np
 import pandas as pd
 import pydeck as pdk
 import streamlit as st
-from shapely.geometry import LineString, MultiLineString
 
-from cmt_solutions import cmt_data
-from source_modelling import magnitude_scaling
-from source_modelling.community_fault_model import community_fault_model_as_geodataframe
-from source_modelling.sources import Plane
+from cmt_solutions import cmt_data, rupture
+from cmt_solutions.geometry import (
+    fault_traces_dataframe,
+    grid_bins,
+    segments_from_corners,
+)
 
 st.set_page_config(layout="wide")
 
-def split_dateline_shapely(geom: LineString) -> LineString or MultiLineString:
+
+@st.cache_resource
+def load_fault_data() -> pd.DataFrame:
     """
-    Split geometry at the dateline (±180°).
+    Loads the community fault model and processes it for visualization.
 
-    Parameters
-    ----------
-    geom : LineString
-        Input LineString geometry.
+    Cached for the lifetime of the Streamlit server, as the fault model does
+    not change between reruns and is slow to import and load.
 
     Returns
     -------
-    LineString or MultiLineString
-        Geometry split at the dateline if necessary.
-    """
-    if geom.is_empty:
-        return geom
-    coords = list(geom.coords)
-    parts = []
-    current_part = [coords[0]]
-    for (lon1, lat1), (lon2, lat2) in zip(coords[:-1], coords[1:]):
-        if abs(lon2 - lon1) > 180:
-            if lon1 > 0:
-                lon_cross = 180
-            else:
-                lon_cross = -180
-            frac = (lon_cross - lon1) / (lon2 - lon1)
-            lat_cross = lat1 + frac * (lat2 - lat1)
-            current_part.append((lon_cross, lat_cross))
-            parts.append(LineString(current_part))
-            lon_cross = -180 if lon_cross == 180 else 180
-            current_part = [(lon_cross, lat_cross), (lon2, lat2)]
-        else:
-            current_part.append((lon2, lat2))
-    parts.append(LineString(current_part))
-    if len(parts) == 1:
-        return parts[0]
-    return MultiLineString(parts)
-
-
-# corners expected as a (4,2) array from `np1.corners[:, :2]` etc.
-def segments_from_corners(corners: list, strike: float, color: list, segments_per_line: int = 20, keep_stride: int = 2):
-    """
-    Create solid and dashed line layers from the corners of a fault plane.
-
-    Parameters
-    ----------
-    corners : list
-        List of four (lon, lat) corner coordinates of the fault plane.
-    strike : float
-        Strike angle of the fault plane in degrees.
-    color : list
-        RGB color for the line layers.
-    segments_per_line : int, optional
-        Number of segments to divide each dashed line into.
-    keep_stride : int, optional
-        Stride for keeping segments to simulate dashes.
+    pd.DataFrame
+        DataFrame containing fault traces and attributes for visualization.
     """
-    corners = np.asarray(corners)
-    if corners.shape != (4, 2):
-        raise ValueError("Expected corners shape (4,2)")
-
-    # Heuristic: lat in [-90,90], lon in [-180,180]
-    col0_in_lon_range = (np.abs(corners[:, 0]) <= 180).all() and (
-        np.abs(corners[:, 0]) > 90
-    ).any()
-    col1_in_lon_range = (np.abs(corners[:, 1]) <= 180).all() and (
-        np.abs(corners[:, 1]) > 90
-    ).any()
-
-    if col0_in_lon_range and not col1_in_lon_range:
-        lon = corners[:, 0]
-        lat = corners[:, 1]
-    elif col1_in_lon_range and not col0_in_lon_range:
-        lon = corners[:, 1]
-        lat = corners[:, 0]
-    else:
-        lat = corners[:, 0]
-        lon = corners[:, 1]
-
-    def row(i: int, j: int):
-        return {
-            "lon1": float(lon[i]),
-            "lat1": float(lat[i]),
-            "lon2": float(lon[j]),
-            "lat2": float(lat[j]),
-            "strike": float(strike),
-        }
-
-    # solid single segment (0->1)
-    solid_df = pd.DataFrame([row(0, 1)])
-
-    # original dashed segments (1->2, 2->3, 3->0)
-    raw_dashed = [row(1, 2), row(2, 3), row(3, 0)]
-
-    # build many short segments and keep every `keep_stride` piece to simulate dashes
-    dash_pieces = []
-    for seg in raw_dashed:
-        lon_a, lat_a = seg["lon1"], seg["lat1"]
-        lon_b, lat_b = seg["lon2"], seg["lat2"]
-        # linear interpolation (simple and usually fine for short lines)
-        lons = np.linspace(lon_a, lon_b, segments_per_line + 1)
-        lats = np.linspace(lat_a, lat_b, segments_per_line + 1)
-        for i in range(segments_per_line):
-            if (i % keep_stride) == 0:
-                dash_pieces.append(
-                    {
-                        "lon1": float(lons[i]),
-                        "lat1": float(lats[i]),
-                        "lon2": float(lons[i + 1]),
-                        "lat2": float(lats[i + 1]),
-                        "strike": seg["strike"],
-                    }
-                )
-
-    dashed_segments_df = pd.DataFrame(dash_pieces)
-
-    solid_layer = pdk.Layer(
-        "LineLayer",
-        data=solid_df,
-        get_source_position=["lon1", "lat1"],
-        get_target_position=["lon2", "lat2"],
-        get_color=color,
-        get_width=3,
-        pickable=False,
+    # Imported here as the fault model loader is slow to import
+    from source_modelling.community_fault_model import (
+        community_fault_model_as_geodataframe,
     )
 
-    # dashed simulated via many short visible segments
-    dashed_layer = pdk.Layer(
-        "LineLayer",
-        data=dashed_segments_df,
-        get_source_position=["lon1", "lat1"],
-        get_target_position=["lon2", "lat2"],
-        get_color=color,
-        get_width=3,
-        pickable=False,
-    )
+    # Load fault model
+    fault_gdf = community_fault_model_as_geodataframe()
+    fault_gdf = fault_gdf.to_crs(epsg=4326)
+    fault_gdf = fault_gdf.reset_index()
 
-    return solid_layer, dashed_layer
+    return fault_traces_dataframe(fault_gdf)
 
 
 def load_data():
@@ -162,61 +49,12 @@ def load_data():
     cmt_df : pd.DataFrame
         DataFrame containing CMT data indexed by PublicID.
     """
-    # Load fault model
-    fault_gdf = community_fault_model_as_geodataframe()
-    fault_gdf = fault_gdf.to_crs(epsg=4326)
-    fault_gdf = fault_gdf.reset_index()
-
-    fault_gdf["trace"] = fault_gdf["trace"].apply(split_dateline_shapely)
+    fault_df = load_fault_data()
 
+    # CMT data is re-read on every rerun so that saved reviews are shown
     cmt_df = cmt_data.get_cmt_data()
     cmt_df = cmt_df.set_index("PublicID")
 
-    # --- Build fault DataFrame for PyDeck (recreate compactly to keep function self-contained) ---
-    all_lines = []
-    fault_names = []
-    dip_ranges = []
-    dip_directions = []
-    rake_ranges = []
-    for idx, geom in enumerate(fault_gdf.geometry):
-        if geom.is_empty:
-            continue
-        if geom.geom_type == "LineString":
-            all_lines.append(list(geom.coords))
-            fault_names.append(fault_gdf.iloc[idx]["name"])
-            dip_ranges.append(fault_gdf.iloc[idx]["dip_range"])
-            dip_directions.append(str(fault_gdf.iloc[idx]["dip_dir"]))
-            rake_ranges.append(fault_gdf.iloc[idx]["rake_range"])
-        elif geom.geom_type == "MultiLineString":
-            for part in geom.geoms:
-                all_lines.append(list(part.coords))
-                fault_names.append(fault_gdf.iloc[idx]["name"])
-                dip_ranges.append(fault_gdf.iloc[idx]["dip_range"])
-                dip_directions.append(str(fault_gdf.iloc[idx]["dip_dir"]))
-                rake_ranges.append(fault_gdf.iloc[idx]["rake_range"])
-
-    fault_df = pd.DataFrame(
-        {
-            "path": all_lines,
-            "fault_name": fault_names,
-            "dip_range": dip_ranges,
-            "dip_direction": dip_directions,
-            "rake_range": rake_ranges,
-        }
-    )
-    fault_df["tooltip"] = (
-        "<div style='font-family:Arial,Helvetica,sans-serif;font-size:12px;'>"
-        + "<b>Fault:</b> "
-        + fault_df["fault_name"].astype(str)
-        + "<br><b>Dip:</b> "
-        + fault_df["dip_range"].astype(str)
-        + "<br><b>Dip dir:</b> "
-        + fault_df["dip_direction"].astype(str)
-        + "<br><b>Rake:</b> "
-        + fault_df["rake_range"].astype(str)
-        + "</div>"
-    )
-
     return fault_df, cmt_df
 
 
@@ -309,27 +147,12 @@ def render_event_review(event_id: str, cmt_gdf: pd.DataFrame, fault_df: pd.DataF
         get_radius=event.Mw * 200,
     )
 
-    # --- Create plane visuals (uses magnitude_scaling, Plane, and segments_from_corners in module) ---
-    length_np1, width_np1 = magnitude_scaling.magnitude_to_length_width(
-        magnitude_scaling.ScalingRelation.LEONARD2014, event.Mw, event["rake1"]
+    # --- Create plane visuals (uses the Leonard2014 rupture planes and segments_from_corners) ---
+    np1 = rupture.nodal_plane(
+        event.Latitude, event.Longitude, event.Mw, event["strike1"], event["dip1"], event["rake1"]
     )
-    length_np2, width_np2 = magnitude_scaling.magnitude_to_length_width(
-        magnitude_scaling.ScalingRelation.LEONARD2014, event.Mw, event["rake2"]
-    )
-
-    np1 = Plane.from_centroid_strike_dip(
-        np.asarray([event.Latitude, event.Longitude, 0]),
-        event["dip1"],
-        length_np1,
-        width_np1,
-        strike=event["strike1"],
-    )
-    np2 = Plane.from_centroid_strike_dip(
-        np.asarray([event.Latitude, event.Longitude, 0]),
-        event["dip2"],
-        length_np2,
-        width_np2,
-        strike=event["strike2"],
+    np2 = rupture.nodal_plane(
+        event.Latitude, event.Longitude, event.Mw, event["strike2"], event["dip2"], event["rake2"]
     )
 
     np1_corners = np1.corners[:, :2]
@@ -394,6 +217,113 @@ def render_event_review(event_id: str, cmt_gdf: pd.DataFrame, fault_df: pd.DataF
 
     return choice
 
+@st.cache_data
+def overview_bins(events: pd.DataFrame, cell_size_km: float) -> tuple[pd.DataFrame, dict]:
+    """
+    Aggregate events into grid bins for the overview map.
+
+    Cached on the events and bin size, so the bins are only recomputed when
+    the filters change or a review is saved.
+
+    Parameters
+    ----------
+    events : pd.DataFrame
+        Events indexed by PublicID with Latitude, Longitude, Mw and boolean reviewed columns.
+    cell_size_km : float
+        Approximate width of each bin in km.
+
+    Returns
+    -------
+    bins : pd.DataFrame
+        One row per non-empty bin with its position, count, reviewed fraction,
+        maximum Mw, fill colour and tooltip.
+    members : dict
+        Mapping of bin_id to the PublicIDs of the events in the bin.
+    """
+    bins, bin_ids = grid_bins(
+        events["Latitude"].to_numpy(),
+        events["Longitude"].to_numpy(),
+        cell_size_km,
+        reviewed=events["reviewed"].to_numpy(),
+        magnitude=events["Mw"].to_numpy(),
+    )
+    # Red for unreviewed through to green for fully reviewed bins
+    fraction = bins["reviewed_fraction"].to_numpy()
+    bins["color"] = [
+        [int(255 * (1 - f)), int(200 * f), 60, 180] for f in fraction
+    ]
+    bins["tooltip"] = (
+        "<div style='font-family:Arial,Helvetica,sans-serif;font-size:12px;'>"
+        + "<b>Events:</b> "
+        + bins["count"].astype(str)
+        + "<br><b>Reviewed:</b> "
+        + (bins["reviewed_fraction"] * 100).round().astype(int).astype(str)
+        + "%<br><b>Max Mw:</b> "
+        + bins["max_mw"].round(1).astype(str)
+        + "<br>Click to review these events</div>"
+    )
+    members = pd.Series(events.index, index=bin_ids).groupby(level=0).agg(list).to_dict()
+    return bins, members
+
+
+def clear_overview_selection():
+    """Forget the clicked overview bin and clear the map selection, so any bin can be clicked again."""
+    st.session_state.pop("overview_selection", None)
+    st.session_state.pop("overview_map", None)
+
+
+def render_overview(events: pd.DataFrame, cell_size_km: float) -> list or None:
+    """
+    Render the overview map of the events aggregated into bins.
+
+    Parameters
+    ----------
+    events : pd.DataFrame
+        Events indexed by PublicID with Latitude, Longitude, Mw and boolean reviewed columns.
+    cell_size_km : float
+        Approximate width of each bin in km.
+
+    Returns
+    -------
+    list or None
+        The PublicIDs of the events in the bin the user just clicked, None otherwise.
+    """
+    bins, members = overview_bins(events, cell_size_km)
+
+    # Draw each bin's own lon/lat rectangle, as bins are only square at the
+    # reference latitude of the grid
+    bin_layer = pdk.Layer(
+        "PolygonLayer",
+        id="overview_bins",
+        data=bins,
+        get_polygon="polygon",
+        get_fill_color="color",
+        stroked=False,
+        extruded=False,
+        pickable=True,
+        auto_highlight=True,
+    )
+    tooltip = {"html": "{tooltip}", "style": {"backgroundColor": "white", "color": "black"}}
+    view_state = pdk.ViewState(latitude=-41.0, longitude=173.0, zoom=4.5, pitch=0)
+    event = st.pydeck_chart(
+        pdk.Deck(layers=[bin_layer], initial_view_state=view_state, tooltip=tooltip),
+        on_select="rerun",
+        selection_mode="single-object",
+        key="overview_map",
+    )
+
+    selected = event.selection["objects"].get("overview_bins", [])
+    if not selected:
+        st.session_state.pop("overview_selection", None)
+        return None
+    # The selection persists across reruns, so only act when a different bin is clicked
+    selected_bin = (selected[0]["lon"], selected[0]["lat"], cell_size_km)
+    if st.session_state.get("overview_selection") == selected_bin:
+        return None
+    st.session_state.overview_selection = selected_bin
+    return members.get(selected[0]["bin_id"], [])
+
+
 fault_df, cmt_gdf = load_data()
 
 # compute global Mw bounds
@@ -466,9 +396,43 @@ if username:
         if not st.session_state.show_reviewed:
             filtered = filtered[~filtered["reviewed"]]
         st.session_state.filtered_ids = list(filtered.index)
+        st.session_state.pop("region_base_ids", None)
+        clear_overview_selection()
         st.session_state.pos = 0
         st.rerun()
 
+    # Overview of the events matching the magnitude filter, aggregated into bins
+    with st.expander("Overview map", expanded=False):
+        cell_size_km = st.slider("Bin size (km)", min_value=10, max_value=200, value=50, step=10)
+        lo, hi = st.session_state.mw_range
+        overview_df = st.session_state.cmt_work[
+            (st.session_state.cmt_work["Mw"] >= lo)
+            & (st.session_state.cmt_work["Mw"] <= hi)
+        ][["Latitude", "Longitude", "Mw"]]
+        overview_df["reviewed"] = _normalize_reviewed(
+            st.session_state.cmt_work.loc[overview_df.index].get("reviewed", False)
+        )
+        region_ids = render_overview(overview_df, cell_size_km)
+        st.caption("Colour shows the fraction of reviewed events. Click a bin to review its events.")
+
+        if region_ids is not None:
+            # Narrow the navigator to the filtered events within the clicked bin
+            base_ids = st.session_state.get("region_base_ids", st.session_state.filtered_ids)
+            in_region = set(region_ids)
+            region_filtered_ids = [i for i in base_ids if i in in_region]
+            if region_filtered_ids:
+                st.session_state.region_base_ids = base_ids
+                st.session_state.filtered_ids = region_filtered_ids
+                st.session_state.pos = 0
+                st.rerun()
+            st.info("No events in the selected bin match the current filters.")
+
+        if "region_base_ids" in st.session_state and st.button("Show all filtered events"):
+            st.session_state.filtered_ids = st.session_state.pop("region_base_ids")
+            clear_overview_selection()
+            st.session_state.pos = 0
+            st.rerun()
+
     # If filtered list is empty, show message
     if len(st.session_state.filtered_ids) == 0:
         st.info("No events match the current filters. Adjust filters in the left column.")
@@ -0,0 +1,110 @@
+"""
+Records, lists, compares and restores content-addressed snapshots of the CMT
+catalog (see `cmt_solutions.snapshot`).
+
+Take a snapshot after updating, merging or reviewing the catalog, and record
+its ID with the outputs of any simulation run using the catalog.
+"""
+
+from pathlib import Path
+
+import typer
+
+from cmt_solutions.cmt_data import CMT_DATA_PATH
+from cmt_solutions.snapshot import SNAPSHOT_STORE_PATH, SnapshotStore
+from qcore import cli
+
+app = typer.Typer(pretty_exceptions_enable=False)
+
+
+@cli.from_docstring(app)
+def snapshot(
+    catalog_path: Path = CMT_DATA_PATH,
+    message: str = "",
+    store: Path = SNAPSHOT_STORE_PATH,
+):
+    """
+    Record a snapshot of the catalog and print its ID.
+
+    Parameters
+    ----------
+    catalog_path : Path
+        The catalog CSV file.
+    message : str
+        A description of this version of the catalog.
+    store : Path
+        The snapshot store directory.
+    """
+    print(SnapshotStore(store).snapshot(catalog_path, message))
+
+
+@cli.from_docstring(app)
+def list_snapshots(store: Path = SNAPSHOT_STORE_PATH):
+    """
+    List the snapshots in the store, oldest first.
+
+    Parameters
+    ----------
+    store : Path
+        The snapshot store directory.
+    """
+    for manifest in SnapshotStore(store).snapshots():
+        print(
+            f"{manifest['id'][:12]}  {manifest['created']}  {manifest['rows']:>7} events  {manifest['message']}"
+        )
+
+
+@cli.from_docstring(app)
+def diff(
+    old_id: str,
+    new_id: str,
+    store: Path = SNAPSHOT_STORE_PATH,
+):
+    """
+    Print the events added, removed and modified between two snapshots.
+
+    Parameters
+    ----------
+    old_id : str
+        The ID of the earlier snapshot, or a unique prefix of it.
+    new_id : str
+        The ID of the later snapshot, or a unique prefix of it.
+    store : Path
+        The snapshot store directory.
+    """
+    changes = SnapshotStore(store).diff(old_id, new_id)
+    for public_id in changes.added:
+        print(f"+ {public_id}")
+    for public_id in changes.removed:
+        print(f"- {public_id}")
+    for public_id, columns in changes.modified.items():
+        print(f"~ {public_id}: {', '.join(columns)}")
+    print(
+        f"{len(changes.added)} added, {len(changes.removed)} removed, "
+        f"{len(changes.modified)} modified ({len(changes.changed_blocks)} blocks changed)"
+    )
+
+
+@cli.from_docstring(app)
+def restore(
+    snapshot_id: str,
+    output: Path,
+    store: Path = SNAPSHOT_STORE_PATH,
+):
+    """
+    Write the catalog of a snapshot to a CSV file.
+
+    Parameters
+    ----------
+    snapshot_id : str
+        The snapshot ID, or a unique prefix of it.
+    output : Path
+        The CSV file to write, e.g. data/CMT_solutions.csv to roll the catalog back.
+    store : Path
+        The snapshot store directory.
+    """
+    SnapshotStore(store).restore(snapshot_id, output)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,313 @@
+"""
+Exports the epicentre and nodal plane rupture geometry of every CMT solution
+to GeoJSON, GeoPackage or Parquet.
+
+The catalog is streamed in shards which are processed in parallel across a
+process pool, and each shard's features are written out as soon as they are
+ready, so the full feature collection is never held in memory.
+"""
+
+import importlib
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import geopandas as gpd
+import pandas as pd
+import pyogrio
+import typer
+from shapely.geometry import mapping
+
+from cmt_solutions import cmt_data, rupture
+from qcore import cli
+
+app = typer.Typer(pretty_exceptions_enable=False)
+
+# Attribute columns of every feature and their pandas dtypes
+ATTRIBUTE_COLUMNS = {
+    "PublicID": "object",
+    "Date": "object",
+    "feature_type": "object",
+    "plane": "Int64",
+    "Mw": "float64",
+    "CD": "float64",
+    "strike": "float64",
+    "dip": "float64",
+    "rake": "float64",
+    "length_km": "float64",
+    "width_km": "float64",
+    "reviewed": "bool",
+    "source": "object",
+}
+# Coordinate reference system of every output geometry
+CRS = "EPSG:4326"
+# GeoPackage layer and geometry type of each feature type, so each layer has a
+# single geometry type
+GEOPACKAGE_LAYERS = {
+    "epicentre": ("epicentres", "Point"),
+    "nodal_plane": ("nodal_planes", "Polygon"),
+}
+
+
+def features_frame(features: list[dict]) -> gpd.GeoDataFrame:
+    """
+    Collect features into a GeoDataFrame.
+
+    Parameters
+    ----------
+    features : list[dict]
+        Features with a shapely geometry and the attribute columns.
+
+    Returns
+    -------
+    gpd.GeoDataFrame
+        One row per feature with the attribute columns and the geometry in EPSG:4326.
+    """
+    df = pd.DataFrame(
+        {column: [feature[column] for feature in features] for column in ATTRIBUTE_COLUMNS}
+    ).astype(ATTRIBUTE_COLUMNS)
+    return gpd.GeoDataFrame(
+        df, geometry=[feature["geometry"] for feature in features], crs=CRS
+    )
+
+
+class GeoJSONWriter:
+    """
+    Streams features to a GeoJSON FeatureCollection.
+
+    Parameters
+    ----------
+    path : Path
+        The GeoJSON file to write.
+    """
+
+    def __init__(self, path: Path):
+        """Start the FeatureCollection."""
+        self.path = path
+        with open(self.path, "w") as file:
+            file.write('{"type": "FeatureCollection", "features": [\n')
+        self.first = True
+
+    def write(self, features: list[dict]):
+        """
+        Write a batch of features.
+
+        Parameters
+        ----------
+        features : list[dict]
+            Features with a shapely geometry and the attribute columns.
+        """
+        # The file is opened per batch so no file handle is held between shards
+        with open(self.path, "a") as file:
+            for feature in features:
+                if not self.first:
+                    file.write(",\n")
+                self.first = False
+                file.write(
+                    json.dumps(
+                        {
+                            "type": "Feature",
+                            "geometry": mapping(feature["geometry"]),
+                            "properties": {
+                                column: feature[column] for column in ATTRIBUTE_COLUMNS
+                            },
+                        }
+                    )
+                )
+
+    def close(self):
+        """Finish the FeatureCollection."""
+        with open(self.path, "a") as file:
+            file.write("\n]}\n")
+
+
+class GeoPackageWriter:
+    """
+    Streams features to a GeoPackage, with a layer of epicentres and a layer of nodal planes.
+
+    Parameters
+    ----------
+    path : Path
+        The GeoPackage file to write, replaced if it exists.
+    """
+
+    def __init__(self, path: Path):
+        """Remove any existing GeoPackage at the output path."""
+        self.path = path
+        self.path.unlink(missing_ok=True)
+        self.created_layers = set()
+
+    def _write_layer(self, feature_type: str, gdf: gpd.GeoDataFrame):
+        """
+        Append features to the layer of their feature type, creating it if needed.
+
+        Parameters
+        ----------
+        feature_type : str
+            The feature type of the features.
+        gdf : gpd.GeoDataFrame
+            The features.
+        """
+        layer, geometry_type = GEOPACKAGE_LAYERS[feature_type]
+        pyogrio.write_dataframe(
+            gdf,
+            self.path,
+            layer=layer,
+            driver="GPKG",
+            geometry_type=geometry_type,
+            append=layer in self.created_layers,
+        )
+        self.created_layers.add(layer)
+
+    def write(self, features: list[dict]):
+        """
+        Write a batch of features.
+
+        Parameters
+        ----------
+        features : list[dict]
+            Features with a shapely geometry and the attribute columns.
+        """
+        if not features:
+            return
+        gdf = features_frame(features)
+        for feature_type, layer_gdf in gdf.groupby("feature_type", sort=False):
+            self._write_layer(feature_type, layer_gdf)
+
+    def close(self):
+        """Create any layer that no features were written to."""
+        for feature_type, (layer, _) in GEOPACKAGE_LAYERS.items():
+            if layer not in self.created_layers:
+                self._write_layer(feature_type, features_frame([]))
+
+
+class ParquetWriter:
+    """
+    Streams features to a directory of GeoParquet files, one per shard.
+
+    Geometries are stored as WKB in the ``geometry`` column, and each file
+    carries the GeoParquet ``geo`` metadata (CRS, geometry types and bounding
+    box) so GIS tools and `geopandas.read_parquet` read it as geometry.
+
+    Parameters
+    ----------
+    path : Path
+        The directory to write the Parquet files to.
+    """
+
+    def __init__(self, path: Path):
+        """Create the output directory."""
+        self.path = path
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.part = 0
+
+    def write(self, features: list[dict]):
+        """
+        Write a batch of features to a new Parquet file.
+
+        Parameters
+        ----------
+        features : list[dict]
+            Features with a shapely geometry and the attribute columns.
+        """
+        if not features:
+            return
+        features_frame(features).to_parquet(
+            self.path / f"part-{self.part:05d}.parquet", index=False
+        )
+        self.part += 1
+
+    def close(self):
+        """Nothing to finish, each shard is written to its own file."""
+
+
+WRITERS = {
+    ".geojson": GeoJSONWriter,
+    ".json": GeoJSONWriter,
+    ".gpkg": GeoPackageWriter,
+    ".parquet": ParquetWriter,
+}
+
+
+@cli.from_docstring(app)
+def export_rupture_geometry(
+    output: Path,
+    min_mw: float = None,
+    max_mw: float = None,
+    start_date: datetime = None,
+    end_date: datetime = None,
+    bbox: tuple[float, float, float, float] = None,
+    workers: int = None,
+    shard_size: int = 500,
+):
+    """
+    Export the epicentre and nodal plane rupture geometry of the CMT solutions.
+
+    Parameters
+    ----------
+    output : Path
+        Output file, the format is chosen from the suffix: .geojson, .gpkg (with an epicentres and a nodal_planes layer) or .parquet (a directory of GeoParquet files).
+    min_mw : float
+        Minimum magnitude of events to export.
+    max_mw : float
+        Maximum magnitude of events to export.
+    start_date : datetime
+        Earliest event time to export.
+    end_date : datetime
+        Latest event time to export.
+    bbox : tuple[float, float, float, float]
+        Only export events within this box, given as min_lon min_lat max_lon max_lat.
+    workers : int
+        Number of worker processes, by default the number of CPUs.
+    shard_size : int
+        Number of events processed by a worker at a time.
+    """
+    if output.suffix not in WRITERS:
+        raise ValueError(
+            f"Unsupported output format {output.suffix!r}, expected one of {', '.join(WRITERS)}"
+        )
+    workers = workers or os.cpu_count()
+
+    shards = cmt_data.iter_cmt_data(
+        min_mw=min_mw,
+        max_mw=max_mw,
+        start_date=start_date,
+        end_date=end_date,
+        bbox=bbox,
+        chunksize=shard_size,
+    )
+
+    # Import the slow rupture dependencies before the workers are forked, so
+    # that each worker does not import them again
+    importlib.import_module("source_modelling.magnitude_scaling")
+    importlib.import_module("source_modelling.sources")
+
+    writer = WRITERS[output.suffix](output)
+    n_events = 0
+    n_features = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Limit the shards in flight so memory use stays bounded
+            pending = deque()
+            for shard in shards:
+                n_events += len(shard)
+                pending.append(executor.submit(rupture.event_features, shard))
+                if len(pending) >= 2 * workers:
+                    features = pending.popleft().result()
+                    writer.write(features)
+                    n_features += len(features)
+            while pending:
+                features = pending.popleft().result()
+                writer.write(features)
+                n_features += len(features)
+    finally:
+        writer.close()
+
+    print(f"Exported {n_features} features for {n_events} events to {output}")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,206 @@
+"""
+Serves read-only queries over the CMT catalog from a long-running process.
+
+The catalog is loaded and indexed once (see `cmt_solutions.query`) and kept
+in memory, and queries are answered as JSON over HTTP on a TCP port or a Unix
+socket. Responses are cached until the catalog file changes, at which point
+it is reloaded. Use `cmt_solutions.client.CatalogClient` to query the service.
+
+Endpoints
+---------
+GET /health
+    The number of events and the catalog file being served.
+GET /events/<PublicID>
+    A single event.
+GET /events?min_mw=&max_mw=&start_date=&end_date=&bbox=&columns=&limit=
+    The events matching the filters, with dates in ISO format and the bbox
+    and columns as comma separated lists.
+"""
+
+import functools
+import json
+import socketserver
+import threading
+from datetime import datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import typer
+
+from cmt_solutions.client import DEFAULT_HOST, DEFAULT_PORT
+from cmt_solutions.cmt_data import CMT_DATA_PATH
+from cmt_solutions.query import CatalogIndex
+from qcore import cli
+
+app = typer.Typer(pretty_exceptions_enable=False)
+
+# Query parameters accepted by /events and how to parse them
+QUERY_PARAMETERS = {
+    "min_mw": float,
+    "max_mw": float,
+    "start_date": datetime.fromisoformat,
+    "end_date": datetime.fromisoformat,
+    "bbox": lambda value: tuple(float(bound) for bound in value.split(",")),
+    "columns": lambda value: value.split(","),
+    "limit": int,
+}
+
+
+class CatalogService:
+    """
+    Answers catalog queries, caching the responses.
+
+    Parameters
+    ----------
+    path : Path
+        The catalog CSV file to serve.
+    cache_size : int
+        Maximum number of responses to cache.
+    """
+
+    def __init__(self, path: Path, cache_size: int):
+        """Load the catalog and set up the response cache."""
+        self.path = path
+        self.lock = threading.Lock()
+        self.modified = None
+        self.index = None
+        self.cached_response = functools.lru_cache(maxsize=cache_size)(self.response)
+        self.reload_if_modified()
+
+    def reload_if_modified(self):
+        """Reload the catalog and clear the cache if the file has changed since it was loaded."""
+        modified = self.path.stat().st_mtime_ns
+        if modified == self.modified:
+            return
+        with self.lock:
+            if modified != self.modified:
+                self.index = CatalogIndex.from_csv(self.path)
+                self.cached_response.cache_clear()
+                self.modified = modified
+                print(f"Loaded {len(self.index)} events from {self.path}")
+
+    def response(
+        self, modified: int, path: str, query: tuple[tuple[str, str], ...]
+    ) -> tuple[int, bytes]:
+        """
+        Answer a request.
+
+        Parameters
+        ----------
+        modified : int
+            Modification time of the catalog file being served. It is part of
+            the cache key so responses for an earlier version of the catalog
+            are never returned.
+        path : str
+            The request path.
+        query : tuple[tuple[str, str], ...]
+            The sorted query parameters of the request.
+
+        Returns
+        -------
+        int
+            The HTTP status code.
+        bytes
+            The JSON response body.
+        """
+        index = self.index
+        try:
+            if path == "/health":
+                body = {"events": len(index), "path": str(self.path)}
+            elif path.startswith("/events/"):
+                body = index.records([index.event_row(unquote(path[len("/events/"):]))])[0]
+            elif path == "/events":
+                params = dict(query)
+                unknown = set(params) - set(QUERY_PARAMETERS)
+                if unknown:
+                    raise ValueError(f"Unknown query parameters: {', '.join(sorted(unknown))}")
+                params = {name: QUERY_PARAMETERS[name](value) for name, value in params.items()}
+                columns = params.pop("columns", None)
+                limit = params.pop("limit", None)
+                rows = index.query(**params)
+                body = {"count": len(rows), "events": index.records(rows[:limit], columns)}
+            else:
+                return HTTPStatus.NOT_FOUND, json.dumps({"error": f"Unknown path {path}"}).encode()
+        except ValueError as error:
+            status = HTTPStatus.NOT_FOUND if path.startswith("/events/") else HTTPStatus.BAD_REQUEST
+            return status, json.dumps({"error": str(error)}).encode()
+        return HTTPStatus.OK, json.dumps(body).encode()
+
+
+class CatalogRequestHandler(BaseHTTPRequestHandler):
+    """Handles HTTP requests to the catalog service."""
+
+    def do_GET(self):
+        """Answer a GET request from the service's response cache."""
+        service = self.server.service
+        service.reload_if_modified()
+        url = urlsplit(self.path)
+        status, body = service.cached_response(
+            service.modified, url.path.rstrip("/") or "/", tuple(sorted(parse_qsl(url.query)))
+        )
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        """Return the client address for logging, which is empty for Unix sockets."""
+        return self.client_address[0] if self.client_address else "unix socket"
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """An HTTP server listening on a Unix domain socket."""
+
+    daemon_threads = True
+
+
+@cli.from_docstring(app)
+def serve_cmt_catalog(
+    path: Path = CMT_DATA_PATH,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: Path = None,
+    cache_size: int = 1024,
+):
+    """
+    Serve read-only JSON queries over the CMT catalog.
+
+    Parameters
+    ----------
+    path : Path
+        The catalog CSV file to serve.
+    host : str
+        Host to listen on.
+    port : int
+        Port to listen on.
+    socket_path : Path
+        Listen on this Unix socket instead of a TCP port.
+    cache_size : int
+        Maximum number of responses to cache.
+    """
+    service = CatalogService(path, cache_size)
+    if socket_path is not None:
+        socket_path.unlink(missing_ok=True)
+        server = ThreadingUnixHTTPServer(str(socket_path), CatalogRequestHandler)
+        address = socket_path
+    else:
+        server = ThreadingHTTPServer((host, port), CatalogRequestHandler)
+        address = f"http://{host}:{port}"
+    server.service = service
+
+    print(f"Serving the CMT catalog on {address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socket_path is not None:
+            socket_path.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    app()
@@ -1,9 +1,14 @@
 """
 Updates the CMT solutions dataset with the most recent data from GeoNet.
 """
+import io
+from pathlib import Path
+
 import pandas as pd
+import requests
 import typer
 
+from cmt_solutions import profiling
 from cmt_solutions.cmt_data import CMT_DATA_PATH
 from qcore import cli
 
@@ -12,26 +17,65 @@ app = typer.Typer(pretty_exceptions_enable=False)
 CMT_URL = "https://raw.githubusercontent.com/GeoNet/data/main/moment-tensor/GeoNet_CMT_solutions.csv"
 
 @cli.from_docstring(app)
-def update_cmt():
+def update_cmt(
+    profile: bool = False,
+    profile_output: Path = None,
+    profile_dump: Path = None,
+    profile_memory: bool = False,
+):
     """
     Update the CMT solutions dataset with the most recent data from GeoNet.
+
+    Parameters
+    ----------
+    profile : bool
+        Record the time, rows, bytes and peak memory of each stage and write them as JSON.
+    profile_output : Path
+        File to write the profile JSON to, by default it is written to stderr.
+    profile_dump : Path
+        File to write a cProfile dump of the run to.
+    profile_memory : bool
+        Trace allocations to record the peak memory of each stage, which slows the run down.
     """
-    # Read the latest GeoNet CMT solutions
-    geonet_cmt_df = pd.read_csv(CMT_URL, dtype={"PublicID": str})
+    with profiling.profile_run(
+        "update_cmt",
+        enabled=profile,
+        output=profile_output,
+        dump=profile_dump,
+        trace_memory=profile_memory,
+    ):
+        # Read the latest GeoNet CMT solutions
+        with profiling.stage("download_geonet_cmt") as download_stage:
+            response = requests.get(CMT_URL)
+            # Check if the response is valid
+            if response.status_code != 200:
+                raise ValueError("Could not get the GeoNet CMT solutions")
+            download_stage.bytes = len(response.content)
+        with profiling.stage("parse_geonet_cmt") as parse_stage:
+            geonet_cmt_df = pd.read_csv(io.BytesIO(response.content), dtype={"PublicID": str})
+            parse_stage.rows = len(geonet_cmt_df)
 
-    # Add the review columns to the GeoNet data with default values
-    geonet_cmt_df["reviewed"] = False
-    geonet_cmt_df["reviewer"] = ""
-    geonet_cmt_df["source"] = "GeoNet"
+        # Add the review columns to the GeoNet data with default values
+        geonet_cmt_df["reviewed"] = False
+        geonet_cmt_df["reviewer"] = ""
+        geonet_cmt_df["source"] = "GeoNet"
 
-    # Read the current CMT data
-    current_cmt_df = pd.read_csv(CMT_DATA_PATH, dtype={"PublicID": str})
+        # Read the current CMT data
+        with profiling.stage("read_current_cmt") as read_stage:
+            current_cmt_df = pd.read_csv(CMT_DATA_PATH, dtype={"PublicID": str})
+            read_stage.rows = len(current_cmt_df)
+            read_stage.bytes = CMT_DATA_PATH.stat().st_size
 
-    # Remove duplicates based on 'PublicID', keeping the latest entry from GeoNet
-    updated_cmt_df = pd.concat([current_cmt_df, geonet_cmt_df]).drop_duplicates(subset=["PublicID"], keep="first")
+        # Remove duplicates based on 'PublicID', keeping the latest entry from GeoNet
+        with profiling.stage("merge") as merge_stage:
+            updated_cmt_df = pd.concat([current_cmt_df, geonet_cmt_df]).drop_duplicates(subset=["PublicID"], keep="first")
+            merge_stage.rows = len(updated_cmt_df)
 
-    # Save the updated DataFrame back to the CSV file
-    updated_cmt_df.to_csv(CMT_DATA_PATH, index=False)
+        # Save the updated DataFrame back to the CSV file
+        with profiling.stage("write_csv") as write_stage:
+            updated_cmt_df.to_csv(CMT_DATA_PATH, index=False)
+            write_stage.rows = len(updated_cmt_df)
+            write_stage.bytes = CMT_DATA_PATH.stat().st_size
 
 
 if __name__ == "__main__":
@@ -0,0 +1,35 @@
+import copy
+import pickle
+
+import pytest
+
+from cmt_solutions import cmt_data
+from cmt_solutions.catalog import CMTCatalog, CMTEvent
+
+
+@pytest.fixture(scope="module")
+def catalog() -> CMTCatalog:
+    return CMTCatalog.from_csv(cmt_data.CMT_DATA_PATH)
+
+
+@pytest.mark.parametrize(
+    "copy_event",
+    [copy.copy, copy.deepcopy, lambda event: pickle.loads(pickle.dumps(event))],
+    ids=["copy", "deepcopy", "pickle"],
+)
+def test_event_copies(catalog: CMTCatalog, copy_event: object):
+    event = catalog[10]
+    copied = copy_event(event)
+
+    assert isinstance(copied, CMTEvent)
+    assert copied.PublicID == event.PublicID
+    assert copied.to_dict() == event.to_dict()
+
+
+def test_event_missing_attribute(catalog: CMTCatalog):
+    event = catalog[0]
+
+    with pytest.raises(AttributeError):
+        _ = event.not_a_column
+    with pytest.raises(AttributeError):
+        _ = event._not_a_slot
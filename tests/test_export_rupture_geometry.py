@@ -0,0 +1,91 @@
+import importlib.util
+import json
+from pathlib import Path
+from types import ModuleType
+
+import geopandas as gpd
+import pyarrow.parquet as pq
+import pyogrio
+import pytest
+
+from cmt_solutions import cmt_data, rupture
+
+SCRIPT_PATH = Path(__file__).parents[1] / "scripts" / "export_rupture_geometry.py"
+
+
+@pytest.fixture(scope="module")
+def export_rupture_geometry() -> ModuleType:
+    spec = importlib.util.spec_from_file_location("export_rupture_geometry", SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="module")
+def feature_batches() -> list[list[dict]]:
+    return [
+        rupture.event_features(shard)
+        for shard in cmt_data.iter_cmt_data(min_mw=6.5, chunksize=10)
+    ]
+
+
+def test_parquet_round_trip(
+    tmp_path: Path, export_rupture_geometry: ModuleType, feature_batches: list[list[dict]]
+):
+    output = tmp_path / "rupture_geometry.parquet"
+    writer = export_rupture_geometry.ParquetWriter(output)
+    for features in feature_batches:
+        writer.write(features)
+    writer.close()
+
+    parts = sorted(output.glob("*.parquet"))
+    assert len(parts) == len(feature_batches)
+    geo = json.loads(pq.read_schema(parts[0]).metadata[b"geo"])
+    assert geo["columns"]["geometry"]["encoding"] == "WKB"
+    assert set(geo["columns"]["geometry"]["geometry_types"]) == {"Point", "Polygon"}
+
+    gdf = gpd.read_parquet(output)
+    assert gdf.crs.to_epsg() == 4326
+    assert len(gdf) == sum(len(features) for features in feature_batches)
+    expected = [feature["geometry"] for features in feature_batches for feature in features]
+    assert all(gdf.geometry.geom_equals_exact(gpd.GeoSeries(expected, crs=gdf.crs), tolerance=1e-9))
+
+
+def test_geopackage_round_trip(
+    tmp_path: Path, export_rupture_geometry: ModuleType, feature_batches: list[list[dict]]
+):
+    output = tmp_path / "rupture_geometry.gpkg"
+    writer = export_rupture_geometry.GeoPackageWriter(output)
+    for features in feature_batches:
+        writer.write(features)
+    writer.close()
+
+    features = [feature for features in feature_batches for feature in features]
+    assert pyogrio.list_layers(output).tolist() == [
+        ["epicentres", "Point"],
+        ["nodal_planes", "Polygon"],
+    ]
+    for feature_type, layer in [("epicentre", "epicentres"), ("nodal_plane", "nodal_planes")]:
+        info = pyogrio.read_info(output, layer=layer)
+        assert info["crs"] == "EPSG:4326"
+        assert info["capabilities"]["fast_spatial_filter"]
+        gdf = gpd.read_file(output, layer=layer)
+        expected = [feature for feature in features if feature["feature_type"] == feature_type]
+        assert gdf["PublicID"].tolist() == [feature["PublicID"] for feature in expected]
+        assert all(
+            gdf.geometry.geom_equals_exact(
+                gpd.GeoSeries([feature["geometry"] for feature in expected], crs=gdf.crs),
+                tolerance=1e-9,
+            )
+        )
+
+
+def test_geopackage_without_features(tmp_path: Path, export_rupture_geometry: ModuleType):
+    output = tmp_path / "empty.gpkg"
+    writer = export_rupture_geometry.GeoPackageWriter(output)
+    writer.close()
+
+    assert pyogrio.list_layers(output).tolist() == [
+        ["epicentres", "Point"],
+        ["nodal_planes", "Polygon"],
+    ]
@@ -0,0 +1,35 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from cmt_solutions import cmt_data
+from cmt_solutions.query import CatalogIndex
+
+
+@pytest.fixture(scope="module")
+def index() -> CatalogIndex:
+    return CatalogIndex.from_csv(cmt_data.CMT_DATA_PATH)
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {"min_mw": 5.1},
+        {"max_mw": 4.3},
+        {"min_mw": 3.7, "max_mw": 3.7},
+        {"start_date": datetime(2010, 9, 3), "end_date": datetime(2011, 12, 31, 23, 59, 59)},
+        {"end_date": datetime(2005, 1, 1)},
+        {"bbox": (171.0, -44.5, 174.0, -42.0)},
+        {"bbox": (179.0, -40.0, -179.0, -30.0)},
+        {"min_mw": 4.5, "start_date": datetime(2016, 1, 1), "bbox": (172.0, -43.0, 175.0, -40.0)},
+    ],
+)
+def test_query_matches_iter_cmt_data(index: CatalogIndex, filters: dict):
+    expected = pd.concat(
+        cmt_data.iter_cmt_data(columns=["PublicID"], **filters), ignore_index=True
+    )["PublicID"]
+    rows = index.query(**filters)
+
+    assert len(expected) > 0
+    assert index.catalog.column("PublicID")[rows].tolist() == expected.tolist()
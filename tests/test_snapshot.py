@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from cmt_solutions import cmt_data
+from cmt_solutions.snapshot import SnapshotStore
+
+
+@pytest.fixture
+def catalog_df() -> pd.DataFrame:
+    return pd.read_csv(cmt_data.CMT_DATA_PATH, dtype=str, keep_default_na=False).head(200)
+
+
+def test_snapshot_rejects_duplicated_public_ids(tmp_path: Path, catalog_df: pd.DataFrame):
+    catalog_path = tmp_path / "catalog.csv"
+    pd.concat([catalog_df, catalog_df.iloc[[3]]]).to_csv(catalog_path, index=False)
+
+    with pytest.raises(ValueError, match=catalog_df["PublicID"].iloc[3]):
+        SnapshotStore(tmp_path / "store").snapshot(catalog_path)
+
+
+def test_diff_reports_changed_events(tmp_path: Path, catalog_df: pd.DataFrame):
+    store = SnapshotStore(tmp_path / "store")
+    catalog_path = tmp_path / "catalog.csv"
+    catalog_df.to_csv(catalog_path, index=False)
+    old_id = store.snapshot(catalog_path)
+
+    new_df = catalog_df.drop(index=0)
+    new_df.loc[1, "Mw"] = "9.9"
+    new_df.to_csv(catalog_path, index=False)
+    new_id = store.snapshot(catalog_path)
+
+    changes = store.diff(old_id, new_id)
+    assert changes.removed == [catalog_df.loc[0, "PublicID"]]
+    assert changes.added == []
+    assert changes.modified == {catalog_df.loc[1, "PublicID"]: ["Mw"]}
+
+
+def test_restore_gives_the_same_snapshot(tmp_path: Path, catalog_df: pd.DataFrame):
+    store = SnapshotStore(tmp_path / "store")
+    catalog_path = tmp_path / "catalog.csv"
+    catalog_df.sample(frac=1, random_state=0).to_csv(catalog_path, index=False)
+    snapshot_id = store.snapshot(catalog_path)
+
+    restored_path = tmp_path / "restored.csv"
+    store.restore(snapshot_id, restored_path)
+    assert store.snapshot(restored_path) == snapshot_id